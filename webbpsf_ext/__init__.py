@@ -101,7 +101,7 @@ setup_logging(conf.default_logging_level, verbose=False)
 
 # Load a bunch of shortcuts to various functions of interest
 from .bandpasses import miri_filter, nircam_filter, bp_2mass, bp_wise, bp_gaia
-from .webbpsf_ext_core import MIRI_ext, NIRCam_ext
+from .webbpsf_ext_core import MIRI_ext, NIRCam_ext, shutdown_psf_pool
 from .spectra import stellar_spectrum, companion_spec, source_spectrum
 from .coords import jwst_point
 
@@ -1,11 +1,9 @@
 import numpy as np
 import os
 
-import poppy
-
 from . import conf
 from .logging_utils import setup_logging
-from .webbpsf_ext_core import NIRCam_ext
+from .webbpsf_ext_core import NIRCam_ext, _get_mask_wavefront
 from .bandpasses import nircam_filter
 from .bandpasses import nircam_com_th, nircam_com_nd
 
@@ -138,13 +136,15 @@ def coron_trans(name, module='A', pixelscale=None, npix=None, oversample=1,
     mask = NIRCam_BandLimitedCoron(name=name, module=module, bar_offset=bar_offset, auto_offset=None, 
                                    nd_squares=nd_squares, **shifts)
 
-    # Create wavefront to pass through mask and obtain transmission image
+    # Pass wavefront through mask to obtain transmission image
+    # Grid is cached for a given npix and pixelscale (e.g., across masks in `build_mask`)
     bandpass = nircam_filter(filter)
-    wavelength = bandpass.avgwave().to('m')
-    wave = poppy.Wavefront(wavelength=wavelength, npix=npix, pixelscale=pixelscale)
+    wavelength = bandpass.avgwave().to_value('m')
+    wave = _get_mask_wavefront(wavelength, npix, pixelscale)
     
     # Square the amplitude transmission to get intensity transmission
-    im = mask.get_transmission(wave)**2    
+    im = mask.get_transmission(wave)
+    np.square(im, out=im)
 
     return im
 
@@ -1,7 +1,7 @@
 # Import libraries
+import functools
 import numpy as np
 from numpy.polynomial import legendre
-from scipy.special import eval_legendre
 from scipy import stats
 
 from .coords import dist_image
@@ -11,6 +11,40 @@ from .image_manip import frebin
 #    Polynomial fitting
 ###########################################################################
 
+def _legendre_basis(lxvals, ncoeff):
+    """Legendre polynomials P_0 ... P_{ncoeff-1} evaluated at `lxvals`
+    
+    Equivalent to ``[eval_legendre(n, lxvals) for n in range(ncoeff)]``, but
+    builds all degrees at once using Bonnet's recurrence relation, 
+    ``n P_n = (2n-1) x P_{n-1} - (n-1) P_{n-2}``, which is numerically
+    stable on [-1,+1]. Output shape is (ncoeff, nx).
+    """
+    lxvals = np.atleast_1d(np.asarray(lxvals, dtype='float'))
+
+    xfan = np.empty([ncoeff, lxvals.size])
+    xfan[0] = 1
+    if ncoeff > 1:
+        xfan[1] = lxvals
+    for n in range(2, ncoeff):
+        xfan[n] = ((2*n-1) * lxvals * xfan[n-1] - (n-1) * xfan[n-2]) / n
+    return xfan
+
+@functools.lru_cache(maxsize=16)
+def _qr_fit_matrix(abytes, shape):
+    """Least-squares fitting matrix R^+ Q^T for design matrix A (passed as bytes)
+    
+    Depends only on the sampled x-values and polynomial basis, so is reused
+    across repeated fits (e.g., for each grid position of PSF coefficients).
+    Output shape is (ncoeff, nx).
+    """
+    a = np.frombuffer(abytes, dtype='float').reshape(shape)
+    # Perform QR decomposition of the A matrix
+    q, r = np.linalg.qr(a.T, 'reduced')
+    fit_mat = np.linalg.lstsq(r, q.T, rcond=None)[0]
+    fit_mat.setflags(write=False)
+    return fit_mat
+
+
 def jl_poly(xvals, coeff, dim_reorder=False, use_legendre=False, lxmap=None, **kwargs):
     """Evaluate polynomial
     
@@ -53,18 +87,12 @@ def jl_poly(xvals, coeff, dim_reorder=False, use_legendre=False, lxmap=None, **k
         if there is either only one xval or one set of coeff (or both).
     """
 
+    # Handle lists and single values (including 0-d numpy scalars)
+    xvals = np.atleast_1d(np.asarray(xvals, dtype='float'))
+    xdim = xvals.ndim
+
     # How many xvals?
     nx = np.size(xvals)
-    try:
-        xdim = len(xvals.shape)
-    except AttributeError:
-        # Handle list
-        xvals = np.array(xvals)
-        xdim = len(xvals.shape)
-        # Handle single value
-        if xdim == 0:
-            xvals = np.array([xvals])
-            xdim = len(xvals.shape)
 
     if xdim>1:
         raise ValueError('xvals can only have 1 dimension. Found {} dimensions.'.format(xdim))
@@ -96,16 +124,17 @@ def jl_poly(xvals, coeff, dim_reorder=False, use_legendre=False, lxmap=None, **k
 
         # Use Identity matrix to evaluate each polynomial component
         # xfan = legendre.legval(lxvals, np.identity(dim[0]))
-        # Below method is faster for large lxvals
-        xfan = np.asarray([eval_legendre(nn, lxvals) for nn in range(dim[0])])
+        # Below method is faster for all sizes of lxvals
+        xfan = _legendre_basis(lxvals, dim[0])
     else:
-        # Create an array of exponent values
-        parr = np.arange(dim[0], dtype='float')
-        # If 3D, this reshapes xfan to 2D
-        xfan = xvals**parr.reshape((-1,1)) # Array broadcasting
+        # Vandermonde matrix of increasing powers (deg+1, nx)
+        xfan = np.vander(xvals, dim[0], increasing=True).T
 
     # Reshape coeffs to 2D array
     cf = coeff.reshape(dim[0],-1)
+    # Match precision of coefficients (e.g., float32) to avoid upcasting in matmul
+    if np.issubdtype(cf.dtype, np.floating):
+        xfan = xfan.astype(cf.dtype, copy=False)
     if dim_reorder:
         # Coefficients are assumed (deg+1,nx,ny)
         # xvals have length nz
@@ -214,8 +243,8 @@ def jl_poly_fit(x, yvals, deg=1, QR=True, robust_fit=False, niter=25, use_legend
 
         # Use Identity matrix to evaluate each polynomial component
         # a = legendre.legval(lx, np.identity(deg+1))
-        # Below method is faster for large lxvals
-        a = np.asarray([eval_legendre(n, lx) for n in range(deg+1)])
+        # Below method is faster for all sizes of lx
+        a = _legendre_basis(lx, deg+1)
     else:
         # Normalize x values to closer to 1 for numerical stability with large inputs
         xnorm = np.mean(x)
@@ -228,13 +257,12 @@ def jl_poly_fit(x, yvals, deg=1, QR=True, robust_fit=False, niter=25, use_legend
     #coeff_all = np.matmul(cov,np.matmul(a,b))
     
     if QR:
-        # Perform QR decomposition of the A matrix
-        q, r = np.linalg.qr(a.T, 'reduced')
-        # computing Q^T*b (project b onto the range of A)
-        # Use np.matmul instead of np.dot for speed improvement
-        qTb = np.matmul(q.T,b) # q.T @ b 
-        # solving R*x = Q^T*b
-        coeff_all = np.linalg.lstsq(r, qTb, rcond=None)[0]
+        # Solution to R*x = Q^T*b is linear in b, so solve for the 
+        # small (deg+1, nx) fitting matrix R^+ Q^T only once, then apply
+        # it to all pixels with a single matrix multiply
+        a = np.ascontiguousarray(a, dtype='float')
+        fit_mat = _qr_fit_matrix(a.tobytes(), a.shape)
+        coeff_all = np.matmul(fit_mat, b) # fit_mat @ b
     else:
         coeff_all = np.linalg.lstsq(a.T, b, rcond=None)[0]
         
@@ -276,9 +304,7 @@ def jl_poly_fit(x, yvals, deg=1, QR=True, robust_fit=False, niter=25, use_legend
             ind_fit = outliers.sum(axis=0) > 0
             if ind_fit[ind_fit].size == 0: break
             if QR:
-                # Use np.matmul instead of np.dot for speed improvement
-                qTb = np.matmul(q.T,yvals_fix[:,ind_fit]) # q.T @ yvals_fix[:,ind_fit] 
-                coeff_all[:,ind_fit] = np.linalg.lstsq(r, qTb, rcond=None)[0]
+                coeff_all[:,ind_fit] = np.matmul(fit_mat, yvals_fix[:,ind_fit])
             else:
                 coeff_all[:,ind_fit] = np.linalg.lstsq(a.T, yvals_fix[:,ind_fit], rcond=None)[0]
 
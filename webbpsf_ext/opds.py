@@ -4,6 +4,7 @@ import matplotlib
 import matplotlib.pyplot as plt
 
 import os
+import functools
 
 import scipy
 # from scipy.sparse.construct import random
@@ -30,46 +31,63 @@ from tqdm.auto import trange, tqdm
 
 __epsilon = np.finfo(float).eps
 
+def _opd_file_path(file):
+    """Full path to OPD file, checking STPSF data directories if necessary"""
+
+    if os.path.exists(file):
+        return file
+
+    # Check STPSF instrument OPD directory
+    if 'NIRCam' in file:
+        inst = 'NIRCam'
+    elif 'MIRI' in file:
+        inst = 'MIRI'
+    elif 'NIRSpec' in file:
+        inst = 'NIRSpec'
+    elif 'NIRISS' in file:
+        inst = 'NIRISS'
+    elif 'FGS' in file:
+        inst = 'FGS'
+
+    if 'JWST_OTE_OPD' in file:
+        # Location of JWST_OTE_OPD*.fits.gz
+        opd_dir = get_stpsf_data_path()
+    else:
+        opd_dir = os.path.join(get_stpsf_data_path(),inst,'OPD')
+    return os.path.join(opd_dir, file)
+
+@functools.lru_cache(maxsize=4)
+def _load_opd_cached(file, slice=0):
+    """Cached OPD image and header; do not modify outputs in place"""
+
+    with fits.open(_opd_file_path(file)) as hdul:
+        data = hdul[0].data
+        opd_im = data[slice,:,:] if data.ndim==3 else data
+        opd_im = np.array(opd_im)
+        header = hdul[0].header.copy()
+
+    opd_im.setflags(write=False)
+    return opd_im, header
+
+@functools.lru_cache(maxsize=16)
+def OPDFile_npix(file):
+    """Number of pixels across an OPD image, read from the FITS header only"""
+    header = fits.getheader(_opd_file_path(file))
+    return int(header['NAXIS1'])
+
 def OPDFile_to_HDUList(file, slice=0):
     """
     Make a picklable HDUList for ingesting into multiproccessor STPSF
     helper function.
     """
 
-    try:
-        hdul = fits.open(file)
-    except FileNotFoundError:
-        # Check STPSF instrument OPD directory
-        if 'NIRCam' in file:
-            inst = 'NIRCam'
-        elif 'MIRI' in file:
-            inst = 'MIRI'
-        elif 'NIRSpec' in file:
-            inst = 'NIRSpec'
-        elif 'NIRISS' in file:
-            inst = 'NIRISS'
-        elif 'FGS' in file:
-            inst = 'FGS'
-
-        if 'JWST_OTE_OPD' in file:
-            # Location of JWST_OTE_OPD*.fits.gz
-            opd_dir = get_stpsf_data_path()
-        else:
-            opd_dir = os.path.join(get_stpsf_data_path(),inst,'OPD')
-        hdul = fits.open(os.path.join(opd_dir, file))
-    ndim = len(hdul[0].data.shape)
+    # Reuse recently loaded OPD files, but return a fresh copy
+    opd_im, header = _load_opd_cached(file, slice)
 
-    if ndim==3:
-        opd_im = hdul[0].data[slice,:,:]
-    else:
-        opd_im = hdul[0].data
-
-    hdu_new = fits.PrimaryHDU(opd_im)
-    hdu_new.header = hdul[0].header.copy()
+    hdu_new = fits.PrimaryHDU(opd_im.copy())
+    hdu_new.header = header.copy()
     opd_hdul = fits.HDUList([hdu_new])
 
-    hdul.close()
-
     return opd_hdul
 
 
@@ -11,7 +11,8 @@ from .bandpasses import nircam_grism_res, niriss_grism_res
 import logging
 _log = logging.getLogger('webbpsf_ext')
 
-from scipy.interpolate import griddata, RegularGridInterpolator
+from scipy.interpolate import RegularGridInterpolator
+from scipy.interpolate import CloughTocher2DInterpolator
 
 __epsilon = np.finfo(float).eps
 
@@ -114,6 +115,27 @@ def nproc_use(fov_pix, oversample, nwavelengths, coron=False):
 
     return int(nproc)
 
+# Most recently used polynomial basis, shared between successive calls
+# (e.g., field-dependent PSFs evaluated over the same bandpass)
+_coeff_basis_cache = {}
+
+def _coeff_basis(wvals, ncoeff, use_legendre=False, lxmap=None):
+    """Polynomial basis (nwave, ncoeff) for evaluating PSF coefficients
+    
+    Multiplying by coefficients reshaped to (ncoeff, npix) gives the PSF 
+    at each wavelength in `wvals`. Do not modify output in place.
+    """
+    lxmap_key = None if lxmap is None else tuple(lxmap)
+    key = (wvals.tobytes(), ncoeff, use_legendre, lxmap_key)
+    basis = _coeff_basis_cache.get(key)
+    if basis is None:
+        basis = jl_poly(wvals, np.identity(ncoeff), use_legendre=use_legendre, lxmap=lxmap)
+        basis = basis.reshape([len(wvals), ncoeff])
+        basis.setflags(write=False)
+        _coeff_basis_cache.clear()
+        _coeff_basis_cache[key] = basis
+    return basis
+
 def gen_image_from_coeff(inst, coeff, coeff_hdr, sp_norm=None, nwaves=None, 
                          use_sp_waveset=False, return_oversample=False):
     
@@ -133,6 +155,8 @@ def gen_image_from_coeff(inst, coeff, coeff_hdr, sp_norm=None, nwaves=None,
     coeff : ndarray
         A cube of polynomial coefficients for generating PSFs. This is
         generally oversampled with a shape (fov_pix*oversamp, fov_pix*oversamp, deg).
+        For imaging, may also include a leading axis of field points, in which
+        case a cube of images is returned for each spectrum.
     coeff_hdr : FITS header
         Header information saved while generating coefficients.
     sp_norm : :class:`webbpsf_ext.synphot_ext.Spectrum`
@@ -191,24 +215,30 @@ def gen_image_from_coeff(inst, coeff, coeff_hdr, sp_norm=None, nwaves=None,
     w2 = wgood.max()
     wrange = w2 - w1
 
-    # Create a PSF for each wgood wavelength
     use_legendre = True if coeff_hdr['LEGNDR'] else False
     lxmap = [coeff_hdr['WAVE1'], coeff_hdr['WAVE2']]
-    psf_fit = jl_poly(wgood, coeff, use_legendre=use_legendre, lxmap=lxmap)
-
-    # Multiply each monochromatic PSFs by the binned e/sec at each wavelength
-    # Array broadcasting: [nx,ny,nwave] x [1,1,nwave]
-    # Do this for each spectrum/observation
-    if nspec==1:
-        binflux = obs_list[0].sample_binned(flux_unit='count').value
-        psf_fit *= binflux.reshape([-1,1,1])
-        psf_list = [psf_fit]
-    else:
+
+    # Binned e/sec at each wavelength for each spectrum/observation
+    binflux_list = [obs.sample_binned(flux_unit='count').value for obs in obs_list]
+
+    # Polynomial basis at each wavelength, reused across successive calls
+    # Coefficient axis precedes the image axes: (ncoeff,ny,nx) or (nfield,ncoeff,ny,nx)
+    ncoeff = coeff.shape[-3]
+    basis = _coeff_basis(wgood, ncoeff, use_legendre=use_legendre, lxmap=lxmap)
+
+    # Dispersed modes require a PSF for each wgood wavelength
+    if is_grism:
+        # Single GEMM to evaluate a PSF for each wavelength (nwave,ny,nx).
+        # Monochromatic PSFs are scaled by the binned e/sec at each wavelength,
+        # which is folded into the small (nwave,ncoeff) basis matrix rather than
+        # making another pass over the full output cube.
+        # Do this for each spectrum/observation
+        cf = coeff.reshape([ncoeff,-1])
+        psf_shape = (len(wgood),) + coeff.shape[1:]
         psf_list = []
-        for obs in obs_list:
-            binflux = obs.sample_binned(flux_unit='count').value
-            psf_list.append(psf_fit*binflux.reshape([-1,1,1]))
-        del psf_fit
+        for binflux in binflux_list:
+            basis_flux = (basis * binflux.reshape([-1,1])).astype(coeff.dtype, copy=False)
+            psf_list.append((basis_flux @ cf).reshape(psf_shape))
 
     # The number of pixels to span spatially
     fov_pix = int(coeff_hdr['FOVPIX'])
@@ -304,15 +334,33 @@ def gen_image_from_coeff(inst, coeff, coeff_hdr, sp_norm=None, nwaves=None,
 
     # Imaging
     else:
+        # The flux-weighted sum of monochromatic PSFs is linear in the
+        # coefficients. Collapse the polynomial basis with each spectrum
+        # first, then evaluate a single image rather than a PSF per wavelength.
+
         # Create source image slopes (no noise)
         data_list = []
         data_list_over = []
         eps = np.finfo(float).eps
-        for psf_fit in psf_list:
-            data_over = psf_fit.sum(axis=0)
-            data_over[data_over<=eps] = data_over[data_over>eps].min() / 10
-            data_list_over.append(data_over)
-            data_list.append(krebin(data_over, (fov_pix,fov_pix)))
+        for binflux in binflux_list:
+            # Match coefficient precision (e.g., float32) to avoid upcasting the cube
+            weights = (binflux @ basis).astype(coeff.dtype, copy=False)
+            if coeff.ndim==4:
+                # Leading axis of coefficients holds field points (nfield,ncoeff,ny,nx)
+                # Stacked GEMV over flattened pixels; tensordot along axis 1 would
+                # first transpose and copy the full coefficient cube.
+                nfield = coeff.shape[0]
+                data_over = weights @ coeff.reshape(coeff.shape[:2] + (-1,))
+                data_over = data_over.reshape((nfield,) + coeff.shape[2:])
+                for im in data_over:
+                    im[im<=eps] = im[im>eps].min() / 10
+                data_list_over.append(data_over)
+                data_list.append(np.asarray([krebin(im, (fov_pix,fov_pix)) for im in data_over]))
+            else:
+                data_over = np.tensordot(weights, coeff, axes=1)
+                data_over[data_over<=eps] = data_over[data_over>eps].min() / 10
+                data_list_over.append(data_over)
+                data_list.append(krebin(data_over, (fov_pix,fov_pix)))
 
         if nspec == 1: 
             data_list = data_list[0]
@@ -410,13 +458,14 @@ def make_coeff_resid_grid(xin, yin, cf_resid, xgrid, ygrid):
     _log.warning("Interpolating coefficient residuals onto regular grid...")
 
     sh = cf_resid.shape
-    cf_resid_grid = np.zeros([ny,nx,sh[1],sh[2],sh[3]])
 
-    # Cycle through each coefficient to interpolate onto V2/V3 grid
-    for i in range(sh[1]):
-        cf_resid_grid[:,:,i,:,:] = griddata((xin, yin), cf_resid[:,i,:,:], (xnew, ynew), method='cubic')
+    # Same as griddata(method='cubic'), but triangulate input points only 
+    # once and interpolate all coefficients and pixels together
+    points = np.array([xin, yin]).transpose()
+    func = CloughTocher2DInterpolator(points, cf_resid.reshape([sh[0], -1]))
+    cf_resid_grid = func(xnew, ynew)
 
-    return cf_resid_grid
+    return cf_resid_grid.reshape([ny,nx,sh[1],sh[2],sh[3]])
 
 
 def field_coeff_func(v2grid, v3grid, cf_fields, v2_new, v3_new, method='linear'):
@@ -444,11 +493,15 @@ def field_coeff_func(v2grid, v3grid, cf_fields, v2_new, v3_new, method='linear')
                                    bounds_error=False, fill_value=None)
 
     pts = np.array([v3_new,v2_new]).transpose()
+
+    # Interpolator returns float64; keep the precision of the input coefficients
+    # (e.g., float32) so that subsequent PSF evaluation isn't upcast
+    dtype = cf_fields.dtype if np.issubdtype(cf_fields.dtype, np.floating) else float
     
     if np.size(v2_new)>1:
-        res = np.asarray([func(pt).squeeze() for pt in pts])
+        res = np.asarray([func(pt).squeeze().astype(dtype, copy=False) for pt in pts])
     else:
-        res = func(pts)
+        res = func(pts).astype(dtype, copy=False)
 
     # If only 1 point, remove first axes
     res = res.squeeze() if res.shape[0]==1 else res
@@ -4,17 +4,23 @@ import matplotlib
 import matplotlib.pyplot as plt
 
 import os, re
+import functools
+import hashlib
 
 from astropy.io import fits, ascii
 from astropy.table import Table
 import astropy.units as u
 
-from scipy.interpolate import griddata, RegularGridInterpolator, interp1d
+from synphot.units import convert_flux
+
+from scipy.interpolate import RegularGridInterpolator, CloughTocher2DInterpolator, CubicSpline
+from scipy.spatial import Delaunay
 
 from . import conf
 from . import synphot_ext as s_ext
 from .bandpasses import miri_filter, nircam_filter
 from .robust import medabsdev
+from .maths import jl_poly, jl_poly_fit
 
 import logging
 _log = logging.getLogger('webbpsf_ext')
@@ -22,6 +28,13 @@ _log = logging.getLogger('webbpsf_ext')
 from . import __path__
 _spec_dir = Path(__path__[0]) / 'spectral_data/'
 
+# Steradians to square arcsec
+_SR_TO_ASEC2 = (3600*180/np.pi)**2
+# Jupiter radius (km) over 1 AU (km)
+_RJUP_OVER_AU = 71492.0 / 149597870.7
+# 10**(-mag/2.5) = exp(-_MAG_LN10_OVER_2P5 * mag)
+_MAG_LN10_OVER_2P5 = np.log(10.0) / 2.5
+
 def BOSZ_filename(Teff, metallicity, log_g, res, carbon=0, alpha=0):
     """ Generate filename for BOSZ spectrum. """
 
@@ -1103,25 +1116,49 @@ class source_spectrum(object):
             uwave = uwave.value
         if isinstance(uflux, table.Column):
             uflux = uflux.value
-        if isinstance(uflux, table.Column):
+        if isinstance(uflux_e, table.Column):
             uflux_e = uflux_e.value
 
-        # Photometric data points
-        sp_phot = s_ext.ArraySpectrum(uwave, uflux,
-                                      waveunits=wave.unit.name,
-                                      fluxunits=flux.unit.name)
-        sp_phot.convert(self.sp_lowres.waveunits)
-        sp_phot.convert(self.sp_lowres.fluxunits)
+        # Convert photometry to the units of the model spectrum directly,
+        # rather than building and converting intermediate spectrum objects.
+        # Flux conversions are linear at a given wavelength, so a single
+        # factor applies to both the fluxes and their uncertainties.
+        wave_q = uwave * wave.unit
+        wunit_out = self.sp_lowres.waveunits
+        funit_out = self.sp_lowres.fluxunits
+        ones = np.ones_like(uwave)
+        ffac = convert_flux(wave_q, ones*flux.unit, funit_out).value
+        if eflux.unit == flux.unit:
+            efac = ffac
+        else:
+            efac = convert_flux(wave_q, ones*eflux.unit, funit_out).value
 
-        sp_phot_e = s_ext.ArraySpectrum(uwave, uflux_e,
-                                    waveunits=wave.unit.name,
-                                    fluxunits=eflux.unit.name)
-        sp_phot_e.convert(self.sp_lowres.waveunits)
-        sp_phot_e.convert(self.sp_lowres.fluxunits)
+        # Negative values are clipped as in ArraySpectrum (keep_neg=False)
+        self._phot_wave = wave_q.to_value(wunit_out, equivalencies=u.spectral())
+        self._phot_flux = np.clip(uflux * ffac, 0, None)
+        self._phot_eflux = np.clip(uflux_e * efac, 0, None)
 
-        self.sp_phot = sp_phot
-        self.sp_phot_e = sp_phot_e
+        # Spectrum objects are generated on request
+        self._sp_phot = None
+        self._sp_phot_e = None
 
+    @property
+    def sp_phot(self):
+        """Photometric data points as a spectrum object"""
+        if self._sp_phot is None:
+            self._sp_phot = s_ext.ArraySpectrum(self._phot_wave, self._phot_flux,
+                                                waveunits=self.sp_lowres.waveunits,
+                                                fluxunits=self.sp_lowres.fluxunits)
+        return self._sp_phot
+
+    @property
+    def sp_phot_e(self):
+        """Photometric uncertainties as a spectrum object"""
+        if self._sp_phot_e is None:
+            self._sp_phot_e = s_ext.ArraySpectrum(self._phot_wave, self._phot_eflux,
+                                                  waveunits=self.sp_lowres.waveunits,
+                                                  fluxunits=self.sp_lowres.fluxunits)
+        return self._sp_phot_e
 
     def bb_jy(self, wave, T):
         """Blackbody function (Jy)
@@ -1200,23 +1237,22 @@ class source_spectrum(object):
             Should we use the uncertainties in the SED photometry for weighting?
         """
 
-        # Star model and photometric data
+        # Star model
         sp_star = self.sp_lowres
-        sp_phot = self.sp_phot
-        sp_phot_e = self.sp_phot_e
 
         # Which model are we using?
         func_model = self.model_IRexcess if IR_excess else self.model_scale
 
         sp_model = func_model(x, sp_star)
 
-        wvals = sp_phot.wave
+        # Photometric data
+        wvals = self._phot_wave
         wmin, wmax = np.array(wlim)*1e4
         ind = (wvals >= wmin) & (wvals <= wmax)
 
         wvals = wvals[ind]
-        yvals = sp_phot.flux[ind]
-        evals = sp_phot_e.flux[ind]
+        yvals = self._phot_flux[ind]
+        evals = self._phot_eflux[ind]
 
         # Instead of interpolating on a high-resolution grid,
         # we should really rebin onto a more coarse grid.
@@ -1690,6 +1726,54 @@ class planets_sb12(object):
         else:
             return sp
 
+def _read_ascii(file_path, **kwargs):
+    """Read an ASCII table, caching the parsed result
+
+    Tables are cached by absolute path, modification time, and
+    keyword arguments (which must be hashable). A copy is returned
+    so callers are free to modify the output.
+    """
+    mtime = os.path.getmtime(file_path)
+    tbl = _read_ascii_cached(os.path.abspath(file_path), mtime, **kwargs)
+    return tbl.copy()
+
+@functools.lru_cache(maxsize=32)
+def _read_ascii_cached(file_path, mtime, **kwargs):
+    return ascii.read(file_path, **kwargs)
+
+@functools.lru_cache(maxsize=8)
+def _zhu15_mag_cube(fname, mtime, truncated):
+    """Zhu (2015) accretion magnitudes as a dense (Mdot, Rin, filter) cube
+
+    Results are cached for each file path, modification time, and
+    disk truncation flag. Returned arrays are shared between calls
+    and should not be modified.
+    """
+
+    names = ('MMdot', 'Rin', 'Tmax', 'J', 'H', 'K', 'L', 'M', 'N', 'J2', 'H2', 'K2', 'L2', 'M2', 'N2')
+    tbl = ascii.read(fname, guess=True, names=names)
+
+    if truncated:
+        mag_names = ('J2', 'H2', 'K2', 'L2', 'M2', 'N2')
+    else:
+        mag_names = ('J', 'H', 'K', 'L', 'M', 'N')
+
+    # Inner radius values and Mdot values
+    rin_vals = np.unique(tbl['Rin'].data)
+    mdot_vals = np.unique(tbl['MMdot'].data)
+    nmdot, nrin = (len(mdot_vals), len(rin_vals))
+
+    # Scatter table rows into a contiguous (Mdot, Rin, filter) grid
+    mdot_idx = np.searchsorted(mdot_vals, tbl['MMdot'].data)
+    rin_idx = np.searchsorted(rin_vals, tbl['Rin'].data)
+    mag_cube = np.full([nmdot, nrin, len(mag_names)], np.nan)
+    mag_cube[mdot_idx, rin_idx, :] = np.column_stack([tbl[m].data for m in mag_names])
+
+    for arr in (mdot_vals, rin_vals, mag_cube):
+        arr.flags.writeable = False
+
+    return mdot_vals, rin_vals, mag_cube
+
 def sp_accr(mmdot, rin=2, dist=10, truncated=False,
             waveout='angstrom', fluxout='photlam', base_dir=None):
 
@@ -1730,42 +1814,35 @@ def sp_accr(mmdot, rin=2, dist=10, truncated=False,
     base_dir = _spec_dir if base_dir is None else base_dir
     fname = os.path.join(base_dir, 'zhu15_accr.txt')
 
-    names = ('MMdot', 'Rin', 'Tmax', 'J', 'H', 'K', 'L', 'M', 'N', 'J2', 'H2', 'K2', 'L2', 'M2', 'N2')
-    tbl = ascii.read(fname, guess=True, names=names)
-
-    # Inner radius values and Mdot values
-    rin_vals = np.unique(tbl['Rin'])
-    mdot_vals = np.unique(tbl['MMdot'])
-    nmdot = len(mdot_vals)
+    # Magnitude cube of shape (nmdot, nrin, 6)
+    mtime = os.path.getmtime(fname)
+    mdot_vals, rin_vals, mag_cube = _zhu15_mag_cube(fname, mtime, truncated)
 
     assert (rin >=rin_vals.min())  & (rin <=rin_vals.max()), "rin is out of range"
     assert (mmdot>=mdot_vals.min()) & (mmdot<=mdot_vals.max()), "mmdot is out of range"
 
-    if truncated:
-        mag_names = ('J2', 'H2', 'K2', 'L2', 'M2', 'N2')
-    else:
-        mag_names = ('J', 'H', 'K', 'L', 'M', 'N')
     wcen = np.array([ 1.2,  1.6, 2.2, 3.8, 4.8, 10.0])
     zpt  = np.array([1600, 1020, 657, 252, 163, 39.8])
 
-    mag_arr = np.zeros([6,nmdot])
-    for i, mv in enumerate(mdot_vals):
-        for j, mag in enumerate(mag_names):
-            tbl_sub = tbl[tbl['MMdot']==mv]
-            rinvals = tbl_sub['Rin']
-            magvals = tbl_sub[mag]
-
-            mag_arr[j,i] = np.interp(rin, rinvals, magvals)
-
-    mag_vals = np.zeros(6)
-    for j in range(6):
-        xi = 10**(mmdot)
-        xp = 10**(mdot_vals)
-        yp = 10**(mag_arr[j])
-        mag_vals[j] = np.log10(np.interp(xi, xp, yp))
-
-    mag_vals += 5*np.log10(dist/10)
-    flux_Jy = 10**(-mag_vals/2.5) * zpt
+    # Linearly interpolate all Mdot values and filters at rin
+    if len(rin_vals)==1:
+        mag_arr = mag_cube[:, 0, :].T
+    else:
+        i1 = np.clip(np.searchsorted(rin_vals, rin), 1, len(rin_vals)-1)
+        i0 = i1 - 1
+        w = (rin - rin_vals[i0]) / (rin_vals[i1] - rin_vals[i0])
+        mag_arr = ((1-w)*mag_cube[:, i0, :] + w*mag_cube[:, i1, :]).T
+
+    # Interpolate all filters at mmdot with shared weights
+    xi = 10**(mmdot)
+    xp = 10**(mdot_vals)
+    yp = 10**(mag_arr)
+    k = np.clip(np.searchsorted(xp, xi), 1, len(xp)-1)
+    w = (xi - xp[k-1]) / (xp[k] - xp[k-1])
+    mag_vals = np.log10((1-w)*yp[:,k-1] + w*yp[:,k])
+
+    # Absolute mags to flux, including distance modulus: 10**(-0.4*DM) = (10/d)**2
+    flux_Jy = zpt * (10.0/dist)**2 * 10.0**(-0.4*mag_vals)
 
     sp = s_ext.ArraySpectrum(wcen*1e4, flux_Jy, fluxunits='Jy')
     sp.convert(waveout)
@@ -1808,24 +1885,17 @@ def jupiter_spec(dist=10, waveout='angstrom', fluxout='photlam', base_dir=None):
     # Column 10: Mdwarf spectral irradiance spectrum (W micron-1)
     #            (Mdwarf Radius = 97995.0 km)
 
-    data = ascii.read(fname, data_start=14)
+    data = _read_ascii(fname, data_start=14)
 
     wspec = data['col1'] * 1e4 # Angstrom
     fspec = data['col8'] * 1e3 # erg s-1 cm^-2 A^-1 sr^-1
-    
-    # Steradians to square arcsec
-    sr_to_asec2 = (3600*180/np.pi)**2
-    fspec /= sr_to_asec2       # *** / arcsec^2
-
-    # Angular size of Jupiter at some distance
-    RJup_km = 71492.0
-    au_to_km = 149597870.7
-    # Angular size (arcsec) of Jupiter radius
-    RJup_asec = RJup_km / au_to_km / dist
+
+    # Angular size (arcsec) of Jupiter radius at some distance
+    RJup_asec = _RJUP_OVER_AU / dist
     area = np.pi * RJup_asec**2
     
-    # flux in f_lambda
-    fspec *= area        # erg s-1 cm^-2 A^-1
+    # flux in f_lambda (sr^-1 -> arcsec^-2, then multiply by area)
+    fspec *= (area / _SR_TO_ASEC2)  # erg s-1 cm^-2 A^-1
 
     sp = s_ext.ArraySpectrum(wspec, fspec, fluxunits='flam')
     sp.convert(waveout)
@@ -1838,7 +1908,8 @@ def linder_table(file=None, **kwargs):
     """Load Linder Model Table
 
     Function to read in isochrone models from Linder et al. 2019.
-    Returns an astropy Table.
+    Returns an astropy Table. Parsed tables are cached in memory, 
+    and each call returns a new copy that is safe to modify.
 
     Parameters
     ----------
@@ -1861,69 +1932,67 @@ def linder_table(file=None, **kwargs):
         if not os.path.exists(file):
             raise ValueError(f"File {file_path} not found.")
 
-    with open(file_path) as f:
-        content = f.readlines()
+    # Parsed tables are cached; return a copy to protect the cache
+    mtime = os.path.getmtime(file_path)
+    tbl = _linder_table_cached(os.path.abspath(file_path), mtime)
 
-    content = [x.strip('\n') for x in content]
+    return tbl.copy()
+
+@functools.lru_cache(maxsize=8)
+def _linder_table_cached(file_path, mtime):
+    """Parse Linder et al. isochrone file (cached by path and mtime)"""
+
+    # Check for previously parsed data saved alongside the text file
+    cache_file = file_path + '.cache.npz'
+    if os.path.exists(cache_file) and (os.path.getmtime(cache_file) >= mtime):
+        with np.load(cache_file) as d:
+            return Table(d['data'], names=list(d['cnames']))
 
-    cnames = content[2].split(',')
+    # Column names are stored in the third header line
+    with open(file_path) as f:
+        header = [f.readline() for _ in range(3)]
+
+    cnames = header[2].strip('\n').split(',')
     cnames = [name.split(':')[1] for name in cnames]
-    ncol = len(cnames)
-    
-    content_arr = []
-    for line in content[4:]:
-        arr = np.array(line.split()).astype(float)
-        if len(arr)>0: 
-            content_arr.append(arr)
-    
-    content_arr = np.array(content_arr)
 
-    # Convert to Astropy Table
-    tbl = Table(rows=content_arr, names=cnames)
+    # Parse data with the C tokenizer; header lines are comments
+    tbl = ascii.read(file_path, format='no_header', names=cnames, comment='#',
+                     guess=False, fast_reader=True)
+    for cn in tbl.colnames:
+        tbl[cn] = tbl[cn].astype('float64')
+
+    data = np.array([tbl[cn].data for cn in cnames]).T
+    _save_npz_cache(cache_file, data=data, cnames=np.array(cnames))
     
     return tbl
-    
-def linder_filter(table, filt, age, dist=10, cond_file=None, 
-                  extrapolate=True, **kwargs):
-    """Linder Mags vs Mass Arrays
-    
-    Given a Linder table, filter name, and age (Myr), return arrays of MJup 
-    and Vega mags. If distance (pc) is provided, then return the apparent 
-    magnitude, otherwise absolute magnitude at 10pc.
-    
-    This function takes the isochrones tables from Linder et al 2019 and
-    creates a irregular contour grid of filter magnitude and log(age)
-    where the z-axis is log(mass). This is mapped onto a regular grid
-    that is interpolated within the data boundaries and linearly
-    extrapolated outside of the region of available data.
-    
-    Parameters
-    ==========
-    table : astropy table
-        Astropy table output from `linder_table`.
-    filt : string
-        Name of NIRCam filter.
-    age : float
-        Age in Myr of planet.
 
-    Keyword Args
-    =============
-    dist : float
-        Distance in pc. Default is 10pc (abs mag).
-    cond_file : string
-        COND file to use for extrapolating to higher masses.
-    extrapolate : bool
-        If True, extrapolate to higher masses using COND models
-        as well as lower masses using a lower order polynomial fit.
+def _save_npz_cache(cache_file, **kwargs):
+    """Save parsed table data to a .npz file, skipping if not writable"""
+    try:
+        np.savez(cache_file, **kwargs)
+    except OSError as e:
+        _log.debug(f'Unable to save table cache {cache_file}: {e}')
+
+def _linder_mass_grid(table, filt, cond_file=None, extrapolate=True, wint=None):
+    """Linder log(mass) surface as function of log(age) and magnitude
+
+    Age-independent portion of `linder_filter`. Returns a regular grid
+    interpolator function of log10(Mass/Mearth) sampled at (log(Age/yr), mag),
+    the magnitude grid, and the maximum magnitude of the Linder data.
+    Grid cells outside the convex hull of the Linder (and COND) model points
+    are NaN.
+    The output can be passed to `linder_filter` via the `_mass_grid` keyword
+    to avoid recomputing the surface for multiple ages.
+
+    If `filt` is not tabulated, magnitudes are interpolated at wavelength
+    `wint` (um). If `wint` is None, it is determined from the filter bandpass.
     """
 
-    from .maths import jl_poly, jl_poly_fit
-    
     # In the event of underscores within name
     filt = filt.split('_')[0]
 
     try:
-        x = table[filt]
+        x = np.asarray(table[filt], dtype=np.float64)
     except KeyError:
         # In case specific filter doesn't exist, interpolate
         x = []
@@ -1945,15 +2014,20 @@ def linder_filter(table, filt, age, dist=10, cond_file=None,
 
         # Turn table data into array and interpolate at filter wavelength
         tbl_arr = np.array([table[cn].data for cn in cnames]).transpose()
-        try:
-            bp = nircam_filter(filt)
-        except:
-            bp = miri_filter(filt)
-        wint = bp.avgwave().to_value('um')
-        x = np.array([np.interp(wint, wvals, row) for row in tbl_arr])
+        if wint is None:
+            try:
+                bp = nircam_filter(filt)
+            except:
+                bp = miri_filter(filt)
+            wint = bp.avgwave().to_value('um')
+        # Linear interpolation weights are shared by all rows
+        # (clip to emulate np.interp behavior outside of wvals range)
+        i1 = np.clip(np.searchsorted(wvals, wint), 1, len(wvals)-1)
+        w = np.clip((wint - wvals[i1-1]) / (wvals[i1] - wvals[i1-1]), 0, 1)
+        x = (1-w)*tbl_arr[:,i1-1] + w*tbl_arr[:,i1]
         
-    y = table['log(Age/yr)'].data
-    z = table['Mass/Mearth'].data
+    y = np.asarray(table['log(Age/yr)'], dtype=np.float64)
+    z = np.asarray(table['Mass/Mearth'], dtype=np.float64)
     zlog = np.log10(z)
 
     #######################################################
@@ -1968,23 +2042,23 @@ def linder_filter(table, filt, age, dist=10, cond_file=None,
             mag2, age2, mass2_mjup = np.load(npsave_file)
         else:
             d_tbl2 = cond_table(file=cond_file) # Dictionary of ages
-            mass2_mjup = []
-            mag2 = []
-            age2 = []
-            for k in d_tbl2.keys():
-                tbl2 = d_tbl2[k]
-                mass2_mjup = mass2_mjup + list(tbl2['MJup'].data)
+
+            # Preallocate output arrays and fill each age block in place
+            sizes = np.array([len(tbl2) for tbl2 in d_tbl2.values()])
+            offsets = np.cumsum(np.append(0, sizes))
+            mass2_mjup = np.empty(offsets[-1])
+            mag2 = np.empty(offsets[-1])
+            age2 = np.empty(offsets[-1])
+            for i, (k, tbl2) in enumerate(d_tbl2.items()):
+                i1, i2 = (offsets[i], offsets[i+1])
+                mass2_mjup[i1:i2] = tbl2['MJup'].data
                 try:
-                    mag2 = mag2 + list(tbl2[filt+'a'].data) # NIRCam
+                    mag2[i1:i2] = tbl2[filt+'a'].data # NIRCam
                 except KeyError:        
                     filt_alt = {'F1065C':'F1000W', 'F1140C':'F1130W', 'F1550C':'F1500W', 'F2300C':'F2100W'}
                     fcol = filt_alt.get(filt, filt)
-                    mag2 = mag2 + list(tbl2[fcol].data)  # MIRI
-                age2 = age2 + list(np.ones(len(tbl2))*k)
-        
-            mass2_mjup = np.array(mass2_mjup)
-            mag2 = np.array(mag2)
-            age2 = np.array(age2)
+                    mag2[i1:i2] = tbl2[fcol].data  # MIRI
+                age2[i1:i2] = k
         
             mag_age_mass = np.array([mag2,age2,mass2_mjup])
             np.save(npsave_file, mag_age_mass)    
@@ -2011,39 +2085,112 @@ def linder_filter(table, filt, age, dist=10, cond_file=None,
     ygrid = np.arange(ylim[0], ylim[1]+dy, dy)
     X, Y = np.meshgrid(xgrid, ygrid)
     
-    zgrid = griddata((x,y), zlog, (X, Y), method='cubic')
-    # There will be NaN's along the border that need to be replaced
-    ind_nan = np.isnan(zgrid)
+    # Triangulation of Linder data
+    tri = Delaunay(np.column_stack([x, y]))
+    xu, yu, zu = x, y, zlog
     if extrapolate:
-        # Replace some NaNs with COND grid
-        zgrid_cond = griddata((x2,y2), zlog2, (X, Y), method='cubic')
-        zgrid[ind_nan] = zgrid_cond[ind_nan]
-        ind_nan = np.isnan(zgrid)
+        # Include COND points that lie outside the Linder data footprint 
+        # in order to fill in higher masses. A single triangulation over 
+        # the combined points covers both regions.
+        ind_out = tri.find_simplex(np.column_stack([x2, y2])) < 0
+        if ind_out.any():
+            xu = np.concatenate([x, x2[ind_out]])
+            yu = np.concatenate([y, y2[ind_out]])
+            zu = np.concatenate([zlog, zlog2[ind_out]])
+            tri = Delaunay(np.column_stack([xu, yu]))
+
+    # Piecewise cubic interpolation onto regular grid.
+    # Equivalent to griddata(method='cubic'), but reuses triangulation.
+    zgrid = CloughTocher2DInterpolator(tri, zu)(X, Y)
+    # Cells outside the convex hull of the model points remain NaN. These are
+    # not filled, which would otherwise create flat mass plateaus along the
+    # edges; `linder_filter` drops them from its output.
     
     # Remove rows/cols with NaN's
     # x is mag, y is log(age), z is log(mass)
     # xgrid2, ygrid2, zgrid2 = _trim_nan_array(xgrid, ygrid, zgrid)
     xgrid2, ygrid2, zgrid2 = xgrid, ygrid, zgrid
 
-    # Create regular grid interpolator function for extrapolation at NaN's
+    # Create regular grid interpolator function
     # Need to us linear method over cubic if not trimming NaN's
     fill_value = None if extrapolate else np.nan
     func = RegularGridInterpolator((ygrid2,xgrid2), zgrid2, method='linear',
                                    bounds_error=False, fill_value=fill_value)
+    
+    return func, xgrid, x.max()
 
-    if extrapolate:
-        # Fix NaN's in zgrid and rebuild func
-        pts = np.array([Y[ind_nan], X[ind_nan]]).transpose()
-        zgrid[ind_nan] = func(pts)
-
-        func = RegularGridInterpolator((ygrid,xgrid), zgrid, method='linear',
-                                       bounds_error=False, fill_value=None)
+def linder_filter(table, filt, age, dist=10, cond_file=None, 
+                  extrapolate=True, _mass_grid=None, _wint=None, **kwargs):
+    """Linder Mags vs Mass Arrays
+    
+    Given a Linder table, filter name, and age (Myr), return arrays of MJup 
+    and Vega mags. If distance (pc) is provided, then return the apparent 
+    magnitude, otherwise absolute magnitude at 10pc.
     
-    # Get mass limits for series of magnitudes at a given age                                
-    age_log = np.log10(age*1e6)
-    mag_abs_arr = xgrid
-    pts = np.array([(age_log,xval) for xval in mag_abs_arr])
-    mass_arr = 10**func(pts) / 318.0 # Convert to MJup
+    This function takes the isochrones tables from Linder et al 2019 and
+    creates a irregular contour grid of filter magnitude and log(age)
+    where the z-axis is log(mass). This is mapped onto a regular grid
+    that is interpolated within the data boundaries.
+    
+    Parameters
+    ==========
+    table : astropy table
+        Astropy table output from `linder_table`.
+    filt : string
+        Name of NIRCam filter.
+    age : float
+        Age in Myr of planet.
+
+    Keyword Args
+    =============
+    dist : float
+        Distance in pc. Default is 10pc (abs mag).
+    cond_file : string
+        COND file to use for extrapolating to higher masses.
+    extrapolate : bool
+        If True, extrapolate to higher masses using COND models
+        as well as lower masses using a lower order polynomial fit.
+
+    Returns
+    =======
+    Arrays of mass (MJup) and magnitude. Only magnitudes on the regular grid 
+    that lie within the convex hull of the model points at the requested age 
+    are returned, so the array length depends on filter and age. Masses are 
+    not extrapolated beyond the hull of the Linder+COND data.
+    """
+
+    res = linder_filter_batch(table, filt, [age], dist=dist, cond_file=cond_file,
+                              extrapolate=extrapolate, _mass_grid=_mass_grid, 
+                              _wint=_wint, **kwargs)
+    return res[0]
+
+def linder_filter_batch(table, filt, ages, dist=10, cond_file=None, 
+                        extrapolate=True, _mass_grid=None, _wint=None, **kwargs):
+    """Linder Mags vs Mass Arrays for multiple ages
+
+    Same as `linder_filter`, but evaluates a list of ages (Myr) while
+    only generating the interpolated mass surface once. The surface is 
+    sampled at all ages in a single call.
+
+    Returns a list of (mass_arr, mag_arr) tuples for each age.
+    """
+
+    if _mass_grid is None:
+        _mass_grid = _linder_mass_grid(table, filt, cond_file=cond_file, 
+                                       extrapolate=extrapolate, wint=_wint)
+    func, xgrid, xmax = _mass_grid
+
+    # Get mass limits for series of magnitudes at each age
+    age_log = np.log10(np.asarray(ages, dtype='float')*1e6)
+    pts = np.empty([len(age_log), len(xgrid), 2])
+    pts[:,:,0] = age_log.reshape([-1,1])
+    pts[:,:,1] = xgrid
+    mass_all = 10**func(pts.reshape([-1,2])).reshape([len(age_log),-1]) / 318.0 # Convert to MJup
+
+    return [_linder_fit_mass(xgrid, mass_arr, xmax, dist) for mass_arr in mass_all]
+
+def _linder_fit_mass(mag_abs_arr, mass_arr, xmax, dist):
+    """Polynomial fit of mass vs magnitude for a single age"""
 
     # Get rid of any NaN's
     ind_use = ~np.isnan(mass_arr)
@@ -2063,23 +2210,26 @@ def linder_filter(table, filt, age, dist=10, cond_file=None,
     #         mass_arr[i] = np.min([mass_arr[i], mass_arr[ind].min()])
 
     # Fit low order polynomial
-    ifit = mag_abs_arr<x.max()
+    ifit = mag_abs_arr<xmax
     xfit = np.append(mag_abs_arr[ifit], mag_abs_arr[-1])
     yfit = np.log10(np.append(mass_arr[ifit], mass_arr[-1]))
-    # Perform a bunch of polynomial fits and find chi^2 to choose optimal degree
-    use_lg = False
-    lxmap = None # np.array([mag_abs_arr.min(), mag_abs_arr.max()])
-    chi2_arr = []
+    # Perform a bunch of polynomial fits and find chi^2 to choose optimal degree.
+    # Fits are nested, so a single QR decomposition of the highest-degree
+    # Vandermonde matrix provides all lower-degree solutions via its
+    # leading columns. Normalize x values for numerical stability.
     deg_arr = np.arange(1,8)
-    for deg in deg_arr:
-        cf = jl_poly_fit(xfit, yfit, deg=deg, use_legendre=use_lg, lxmap=lxmap)
-        vals_fit = 10**jl_poly(mag_abs_arr,cf, use_legendre=use_lg, lxmap=lxmap)
-        chi2 = np.sum((mass_arr - vals_fit)**2)
-        chi2_arr.append(chi2)
+    deg_max = deg_arr.max()
+    xnorm = np.mean(xfit)
+    q, r = np.linalg.qr(np.vander(xfit/xnorm, deg_max+1, increasing=True), 'reduced')
+    qTy = np.matmul(q.T, yfit)
+    cf_arr = np.zeros([deg_max+1, len(deg_arr)])
+    for i, deg in enumerate(deg_arr):
+        cf_arr[:deg+1,i] = np.linalg.solve(r[:deg+1,:deg+1], qTy[:deg+1])
+    # Evaluate all fits at once, shape (nmag, ndeg)
+    vals_fit = 10**np.matmul(np.vander(mag_abs_arr/xnorm, deg_max+1, increasing=True), cf_arr)
+    chi2_arr = np.sum((mass_arr.reshape([-1,1]) - vals_fit)**2, axis=0)
     ind_deg = np.argmin(chi2_arr)
-    deg = deg_arr[ind_deg]
-    cf = jl_poly_fit(xfit, yfit, deg=deg, use_legendre=use_lg, lxmap=lxmap)
-    mass_arr_fit = 10**jl_poly(mag_abs_arr,cf, use_legendre=use_lg, lxmap=lxmap)
+    mass_arr_fit = vals_fit[:,ind_deg]
 
     # Convert to apparent magnitude
     mag_app_arr = mag_abs_arr + 5*np.log10(dist/10.0)
@@ -2091,7 +2241,6 @@ def linder_filter(table, filt, age, dist=10, cond_file=None,
     mag_app_arr = mag_app_arr[isort]
 
     return mass_arr_fin, mag_app_arr
-    
 
 def cond_table(age=None, file=None, **kwargs):
     """Load COND Model Table
@@ -2101,6 +2250,8 @@ def cond_table(age=None, file=None, **kwargs):
     astropy Tables, where each dictionary element corresponds to
     the specific ages within the COND table. Or, if the age keyword is
     specified, then this function only returns a single astropy table.
+    Parsed tables are cached in memory, and each call returns new copies
+    that are safe to modify.
 
     Parameters
     ----------
@@ -2114,26 +2265,6 @@ def cond_table(age=None, file=None, **kwargs):
         Default is model.AMES-Cond-2000.M-0.0.JWST.Vega
     """
 
-    def make_table(*args):
-        i1, i2 = (ind1[i]+4, ind2[i])
-
-        rows = []
-        for line in content[i1:i2]:
-            if (line=='') or ('---' in line):
-                continue
-            else:
-                vals = np.array(line.split(), dtype='float64')
-                rows.append(tuple(vals))
-        tbl = Table(rows=rows, names=cnames)
-
-        # Convert to Jupiter masses
-        newcol = tbl['M/Ms'] * 1047.348644
-        newcol.name = 'MJup'
-        tbl.add_column(newcol, index=1)
-        tbl['MJup'].format = '.2f'
-
-        return tbl
-
     # Default input directory
     base_dir = os.path.join(_spec_dir, 'cond_models/')
     # Default file
@@ -2148,6 +2279,59 @@ def cond_table(age=None, file=None, **kwargs):
         if not os.path.exists(file):
             raise ValueError(f"File {file_path} not found.")
 
+    # Parsed tables are cached; return copies to protect the cache
+    mtime = os.path.getmtime(file_path)
+    ages_myr, tables = _cond_tables_cached(os.path.abspath(file_path), mtime)
+
+    # Return all tables if no age specified
+    if age is None:
+        return {a: tbl.copy() for a, tbl in zip(ages_myr, tables)}
+    else:
+        # Choose closest age
+        i = int(np.argmin(np.abs(ages_myr - age)))
+        return tables[i].copy()
+
+@functools.lru_cache(maxsize=8)
+def _cond_tables_cached(file_path, mtime):
+    """Parse all age blocks of a COND file (cached by path and mtime)
+
+    Returns an array of ages (Myr) and a list of astropy Tables.
+    """
+
+    def make_table(arr):
+        tbl = Table(arr, names=cnames)
+
+        # Convert to Jupiter masses
+        newcol = tbl['M/Ms'] * 1047.348644
+        newcol.name = 'MJup'
+        tbl.add_column(newcol, index=1)
+        tbl['MJup'].format = '.2f'
+
+        return tbl
+
+    # Check for previously parsed data saved alongside the text file
+    cache_file = file_path + '.cache.npz'
+    if os.path.exists(cache_file) and (os.path.getmtime(cache_file) >= mtime):
+        with np.load(cache_file) as d:
+            data, row_ind = (d['data'], d['row_ind'])
+            ages_myr, cnames = (d['ages_myr'], list(d['cnames']))
+    else:
+        data, row_ind, ages_myr, cnames = _parse_cond_file(file_path)
+        _save_npz_cache(cache_file, data=data, row_ind=row_ind, 
+                        ages_myr=ages_myr, cnames=np.array(cnames))
+
+    ages_myr.flags.writeable = False
+    tables = [make_table(data[row_ind[i]:row_ind[i+1]]) for i in range(len(ages_myr))]
+
+    return ages_myr, tables
+
+def _parse_cond_file(file_path):
+    """Parse COND text file
+
+    Returns a 2D array containing data for all ages, the row indices 
+    bounding each age block, an array of ages (Myr), and column names.
+    """
+
     with open(file_path) as f:
         content = f.readlines()
 
@@ -2156,7 +2340,6 @@ def cond_table(age=None, file=None, **kwargs):
     # Column names
     cnames = content[5].split()
     cnames = ['M/Ms', 'Teff'] + cnames[1:]
-    ncol = len(cnames)
 
     # Create a series of tables for each time
     times_gyr = []
@@ -2175,22 +2358,22 @@ def cond_table(age=None, file=None, **kwargs):
     # Everything is Gyr, but prefer Myr
     ages_gyr = np.array(times_gyr, dtype='float64')
     ages_myr = np.array(ages_gyr * 1000, dtype='int')
-    #times = ['{:.0f}'.format(a) for a in ages_myr]
 
-    # Return all tables if no age specified
-    if age is None:
-        tables = {}
-        for i in range(ntimes):
-            tbl = make_table(i, ind1, ind2, content)
-            tables[ages_myr[i]] = tbl
-        return tables
-    else:
-        # This is faster if we only want one table
-        ages_diff = np.abs(ages_myr - age)
-        i = np.where(ages_diff==ages_diff.min())[0][0]
+    # Parse each block of data lines in a single call
+    arr_list = []
+    for i in range(ntimes):
+        i1, i2 = (ind1[i]+4, ind2[i])
+        lines = [line for line in content[i1:i2] if (line!='') and ('---' not in line)]
+        if len(lines)>0:
+            arr = np.loadtxt(lines, dtype='float64', ndmin=2)
+        else:
+            arr = np.zeros([0, len(cnames)])
+        arr_list.append(arr)
 
-        tbl = make_table(i, ind1, ind2, content)
-        return tbl
+    row_ind = np.cumsum([0] + [len(arr) for arr in arr_list])
+    data = np.concatenate(arr_list, axis=0)
+
+    return data, row_ind, ages_myr, cnames
 
 def cond_filter(table, filt, module='A', dist=None, **kwargs):
     """
@@ -2200,12 +2383,10 @@ def cond_filter(table, filt, module='A', dist=None, **kwargs):
     by age.
     """
 
-    from .maths import jl_poly, jl_poly_fit
-
     # Table Data
     try:
         fcol = filt + module.lower()
-        mag_data  = table[fcol].data
+        mag_data  = np.ascontiguousarray(table[fcol], dtype=np.float64)
     except KeyError:
         # MIRI coronagraphic filters are incorrect in the AMES-COND files.
         # It assumes extra attenuation from the central mask, which gives
@@ -2213,10 +2394,10 @@ def cond_filter(table, filt, module='A', dist=None, **kwargs):
         # alternate bandpasses
         filt_alt = {'F1065C':'F1000W', 'F1140C':'F1130W', 'F1550C':'F1500W', 'F2300C':'F2100W'}
         fcol = filt_alt.get(filt, filt)
-        mag_data  = table[fcol].data
+        mag_data  = np.ascontiguousarray(table[fcol], dtype=np.float64)
 
     mcol = 'MJup'
-    mass_data = table[mcol].data
+    mass_data = np.ascontiguousarray(table[mcol], dtype=np.float64)
 
     # Data to interpolate onto
     mass_arr = list(np.arange(0.1,1,0.1)) + list(np.arange(1,10)) \
@@ -2229,7 +2410,8 @@ def cond_filter(table, filt, module='A', dist=None, **kwargs):
     # Extrapolate
     cf = jl_poly_fit(np.log(mass_data), mag_data)
     ind_out = (mass_arr < mass_data.min()) | (mass_arr > mass_data.max())
-    mag_arr[ind_out] = jl_poly(np.log(mass_arr), cf)[ind_out]
+    if ind_out.any():
+        mag_arr[ind_out] = jl_poly(np.log(mass_arr[ind_out]), cf)
 
     # Distance modulus for apparent magnitude
     if dist is not None:
@@ -2268,8 +2450,6 @@ def mass_sensitivity_table(filt, dist=10, extrapolate=True, lfile=None, age_arr=
         Return astropy table object
     """
 
-    from .bandpasses import nircam_filter
-
     if lfile is None:
         lfile = 'BEX_evol_mags_-3_MH_0.00.dat'
     tbl = linder_table(file=lfile)
@@ -2277,13 +2457,15 @@ def mass_sensitivity_table(filt, dist=10, extrapolate=True, lfile=None, age_arr=
     if age_arr is None:
         age_arr = np.arange(1, 21, 1)
 
-    mass_all = []
-    mag_all = []
-    for age in age_arr:
-        mass_data, mag_data = linder_filter(tbl, filt, age, dist, 
-                                            extrapolate=extrapolate, **kwargs)
-        mass_all.append(mass_data)
-        mag_all.append(mag_data)
+    # Filter bandpass
+    bp = nircam_filter(filt)
+    wint = bp.avgwave().to_value('um')
+
+    # Mass surface is independent of age, so evaluate all ages at once
+    res = linder_filter_batch(tbl, filt, age_arr, dist, extrapolate=extrapolate, 
+                              _wint=wint, **kwargs)
+    mass_all = [r[0] for r in res]
+    mag_all = [r[1] for r in res]
 
     # Interpolate masses onto a common magnitude array
     dm = 0.1
@@ -2297,23 +2479,18 @@ def mass_sensitivity_table(filt, dist=10, extrapolate=True, lfile=None, age_arr=
 
     # Convert magnitudes to Jy
     # Get 0th magnitude flux density
-    bp = nircam_filter(filt)
     sp = stellar_spectrum('G2V', 0, 'vegamag', bp)
     obs = s_ext.Observation(sp, bp, binset=bp.wave)
     flux0 = obs.effstim('Jy')
     fluxJy_arr = 10**(-0.4*mag_arr)*flux0
 
+    # Cubic spline of mass vs magnitude for each age (NaN outside of bounds).
+    # Same not-a-knot spline as interp1d(kind='cubic') without the wrapper overhead.
     mass_arr = []
-    for i, mass_vals in enumerate(mass_all):
-        # 
-        fn = interp1d(mag_all[i], mass_vals, kind='cubic', 
-                    bounds_error=False, fill_value=np.nan)
-        mass_arr.append(fn(mag_arr))
-
-        # isort = np.argsort(mag_all[i])
-        # xvals = mag_all[i][isort]
-        # yvals = mass_vals[isort]
-        # mass_arr.append(np.interp(mag_arr, xvals, yvals))
+    for mag_vals, mass_vals in zip(mag_all, mass_all):
+        isort = np.argsort(mag_vals)
+        cs = CubicSpline(mag_vals[isort], mass_vals[isort], extrapolate=False)
+        mass_arr.append(cs(mag_arr))
 
     mass_arr = np.array(mass_arr)
     log_jy = np.log10(fluxJy_arr)
@@ -2423,6 +2600,234 @@ def _trim_nan_array(xgrid, ygrid, zgrid):
         
     return xgrid2, ygrid2, zgrid2
 
+@functools.lru_cache(maxsize=16)
+def _default_linder_mass_grid(filt):
+    """Linder mass surface of the default BEX table for a given filter"""
+    return _linder_mass_grid(linder_table(), filt)
+
+@functools.lru_cache(maxsize=64)
+def _companion_mag_table(model, filt, age, dist):
+    """BEX or COND magnitudes vs mass
+
+    Returns arrays of mass (MJup), Vega mags, and the slope of each 
+    mass interval for a given filter, age (Myr), and distance (pc).
+    Cached for repeated calls to `companion_spec`, so the returned 
+    arrays are read-only.
+    """
+    if model=='bex':
+        # Age-independent mass surface is shared by all ages
+        mass_grid = _default_linder_mass_grid(filt)
+        mass_arr, mag_arr = linder_filter(None, filt, age, dist=dist, _mass_grid=mass_grid)
+    elif model=='cond':
+        table = cond_table(age)
+        mass_arr, mag_arr = cond_filter(table, filt, dist=dist)
+    else:
+        raise ValueError(f"model must be 'bex' or 'cond', not '{model}'")
+
+    isort = np.argsort(mass_arr)
+    mass_arr = np.asarray(mass_arr[isort], dtype=np.float64)
+    mag_arr = np.asarray(mag_arr[isort], dtype=np.float64)
+
+    dmass = np.diff(mass_arr)
+    dmag = np.diff(mag_arr)
+    slopes = np.divide(dmag, dmass, out=np.zeros_like(dmag), where=dmass>0)
+
+    # Protect cached arrays from modification
+    for arr in (mass_arr, mag_arr, slopes):
+        arr.flags.writeable = False
+
+    return mass_arr, mag_arr, slopes
+
+def _interp_mass_mag(mass, mass_arr, mag_arr, slopes):
+    """Interpolate magnitude at mass from output of `_companion_mag_table`
+
+    Same as `np.interp(mass, mass_arr, mag_arr)`, but locates intervals
+    by bisection and uses precomputed slopes.
+    """
+    mass = np.clip(mass, mass_arr[0], mass_arr[-1])
+    i = np.clip(np.searchsorted(mass_arr, mass) - 1, 0, len(slopes)-1)
+    return mag_arr[i] + slopes[i] * (mass - mass_arr[i])
+
+def companion_mags(model, filt, age, masses, dist=10, del_mags=0):
+    """BEX or COND magnitudes for an array of companion masses
+
+    Vectorized version of the magnitude lookup performed in 
+    `companion_spec` for many companions of the same age and distance.
+
+    Parameters
+    ----------
+    model : str
+        Exoplanet evolutionary model ('bex' or 'cond').
+    filt : str
+        Name of filter (e.g., 'F444W').
+    age : float
+        Age in Myr.
+    masses : array_like
+        Companion masses in MJup.
+    dist : float
+        Distance in pc.
+    del_mags : float or array_like
+        Magnitude offsets (e.g., extinction or accretion) added to 
+        each companion.
+
+    Returns
+    -------
+    ndarray
+        Vega magnitudes of each companion.
+    """
+
+    filt = filt.split('_')[0]
+    mag_table = _companion_mag_table(model.lower(), filt, age, dist)
+    masses = np.asarray(masses, dtype=np.float64)
+    return _interp_mass_mag(masses, *mag_table) + del_mags
+
+def _bandpass_filter(bandpass):
+    """Filter name of bandpass (e.g., 'F444W' from 'F444W_NRCA5')
+    
+    Stored on the bandpass object along with the name it was parsed from,
+    so repeated calls with the same bandpass skip the string parsing.
+    """
+    try:
+        name, filt = bandpass._wext_filt
+        if name == bandpass.name:
+            return filt
+    except AttributeError:
+        pass
+
+    filt = bandpass.name.split('_')[0]
+    bandpass._wext_filt = (bandpass.name, filt)
+    return filt
+
+class _BandpassKey:
+    """Cache key for a bandpass based on its name and throughput curve
+
+    Instrument `bandpass` attributes return a new copy on each access, 
+    so caches keyed on object identity would never be reused. Equal 
+    keys share the first wrapped bandpass for evaluation.
+    """
+
+    def __init__(self, bandpass):
+        self.bandpass = bandpass
+        waveset = bandpass.waveset
+        if waveset is None:
+            # Analytic bandpass without a waveset; fall back to identity
+            self._key = (bandpass.name, id(bandpass))
+        else:
+            h = hashlib.sha1(waveset.value.tobytes())
+            h.update(np.asarray(bandpass(waveset).value).tobytes())
+            self._key = (bandpass.name, h.hexdigest())
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __eq__(self, other):
+        return isinstance(other, _BandpassKey) and (self._key == other._key)
+
+# Spectrum/bandpass overlap warnings that have already been logged
+_overlap_warned = set()
+
+def _warn_overlap_once(bandpass, sp_overlap, msg):
+    """Log overlap warning only once per bandpass, overlap status, and message"""
+    key = (bandpass.name, str(sp_overlap), msg)
+    if key not in _overlap_warned:
+        _overlap_warned.add(key)
+        _log.warning(f"Overlap between spectrum and bandpass: {sp_overlap}.")
+        _log.warning(msg)
+
+@functools.lru_cache(maxsize=32)
+def _stellar_model(sptype):
+    """Unnormalized stellar spectrum of a given spectral type
+
+    Cached model spectrum shared by zero-point and template calculations.
+    Do not modify the returned object in place.
+    """
+    return stellar_spectrum(sptype)
+
+@functools.lru_cache(maxsize=64)
+def _extinction_mwrv4(Av, Rv=4.0):
+    """Milky Way extinction curve (Rv=4.0) for extinction magnitude Av
+
+    Cached to avoid reloading the extinction curve file on every call.
+    """
+    return s_ext.Extinction(Av/Rv, name='mwrv4')
+
+def _is_mag_renorm(renorm_args):
+    """Check if renorm_args are (mag, units, bandpass) with Pogson mag units"""
+    if (renorm_args is None) or (len(renorm_args) != 3):
+        return False
+    val, units, _ = renorm_args
+    return np.isscalar(val) and isinstance(units, str) and \
+        (units.lower() in ['vegamag', 'abmag', 'stmag'])
+
+def _stellar_spectrum_mag0(sptype, Av, mag_units, bandpass):
+    """Stellar spectrum with extinction normalized to 0 mag in bandpass
+
+    Renormalization to magnitude `m` in the same bandpass and units is 
+    then a multiplication by ``10**(-0.4*m)``. Cached on bandpass content.
+    """
+    return _stellar_spectrum_mag0_cached(sptype, Av, mag_units, _BandpassKey(bandpass))
+
+@functools.lru_cache(maxsize=64)
+def _stellar_spectrum_mag0_cached(sptype, Av, mag_units, bp_key):
+    sp = _stellar_model(sptype)
+    if Av>0: 
+        sp = sp * _extinction_mwrv4(Av)
+    return sp.renorm(0, mag_units, bp_key.bandpass, force=True)
+
+def stellar_companion_spectra(sptype, masses, bandpass, age, dist=10, model='bex',
+                              del_mags=0, Av=0, waveout='angstrom', fluxout='photlam'):
+    """Stellar template spectra for a set of companion masses
+
+    Each companion uses the same stellar spectral shape, renormalized to 
+    the BEX or COND Vega magnitude in `bandpass` for its mass. Rather than 
+    renormalizing a synphot spectrum per companion, the flux of a single
+    0-mag template is scaled by each magnitude.
+
+    Parameters
+    ----------
+    sptype : str
+        Spectral type of the template spectrum.
+    masses : array_like
+        Companion masses in MJup.
+    bandpass : :class:`s_ext.Bandpass`
+        A synphot bandpass object.
+    age : float
+        Age in Myr.
+    dist : float
+        Distance in pc.
+    model : str
+        Exoplanet evolutionary model ('bex' or 'cond').
+    del_mags : float or array_like
+        Magnitude offsets added to each companion.
+    Av : float
+        Extinction magnitude (assumes Rv=4.0).
+    waveout : str
+        Wavelength units for output.
+    fluxout : str
+        Flux density units for output (e.g., 'photlam', 'flam', 'Jy').
+
+    Returns
+    -------
+    wave : ndarray
+        Wavelength array of template spectrum.
+    flux : ndarray
+        Array of shape (ncompanions, nwave) of each companion spectrum.
+    """
+
+    filt = _bandpass_filter(bandpass)
+    mags = companion_mags(model, filt, age, masses, dist=dist, del_mags=del_mags)
+    mags = np.atleast_1d(mags)
+
+    # Template spectrum at 0 mag
+    sp0 = _stellar_spectrum_mag0(sptype, Av, 'vegamag', bandpass)
+    waveset = sp0.waveset
+    wave = waveset.to_value(s_ext.validate_unit(waveout))
+    flux0 = convert_flux(waveset, sp0(waveset), s_ext.validate_unit(fluxout)).value
+
+    flux = flux0.reshape([1,-1]) * 10**(-0.4*mags.reshape([-1,1]))
+
+    return wave, flux
+
 def companion_spec(bandpass, model='SB12', atmo='hy3s', mass=10, age=100, entropy=10,
     dist=10, accr=False, mmdot=None, mdot=None, accr_rin=2, truncated=False,
     sptype=None, renorm_args=None, Av=0, **kwargs):
@@ -2499,8 +2904,7 @@ def companion_spec(bandpass, model='SB12', atmo='hy3s', mass=10, age=100, entrop
         # Add accretion mag offsets for BEX and COND models
         if (model.lower() in ['bex', 'cond']) and (accr == True):
             if sp_overlap != 'full':
-                _log.warning(f"Overlap between spectrum and bandpass: {sp_overlap}.")
-                _log.warning("Accretion calculation may be unreliable.")
+                _warn_overlap_once(bandpass, sp_overlap, "Accretion calculation may be unreliable.")
             pl = {
                 'atmo': atmo, 'mass': mass, 'age': age,
                 'entropy': entropy, 'distance': dist,
@@ -2523,13 +2927,11 @@ def companion_spec(bandpass, model='SB12', atmo='hy3s', mass=10, age=100, entrop
 
         # Add extinction from the disk
         if Av>0: 
-            Rv = 4.0  
-            sp_ext = sp * s_ext.Extinction(Av/Rv, name='mwrv4')
+            sp_ext = sp * _extinction_mwrv4(Av)
 
             if model.lower() in ['bex', 'cond']:
                 if sp_overlap != 'full':
-                    _log.warning(f"Overlap between spectrum and bandpass: {sp_overlap}.")
-                    _log.warning("Extinction calculation may be unreliable.")
+                    _warn_overlap_once(bandpass, sp_overlap, "Extinction calculation may be unreliable.")
                 obs = s_ext.Observation(sp, bandpass, binset=bandpass.wave)
                 obs_ext = s_ext.Observation(sp_ext, bandpass, binset=bandpass.wave)
                 del_mag += obs_ext.effstim('vegamag') - obs.effstim('vegamag')
@@ -2537,29 +2939,20 @@ def companion_spec(bandpass, model='SB12', atmo='hy3s', mass=10, age=100, entrop
                         
         # For BEX and COND models, set up renorm_args
         # unless renorm_args is already set
-        filt = bandpass.name.split('_')[0]
+        filt = _bandpass_filter(bandpass)
         if (renorm_args is not None) and (len(renorm_args) > 0):
             pass
-        elif model.lower()=='bex':
-            table = linder_table()
-            mass_arr, mag_arr = linder_filter(table, filt, age, dist=dist)
-            mag = np.interp(mass, mass_arr, mag_arr)
-            mag += del_mag  # Apply extinction and/or accretion offsets
-            renorm_args = (mag, 'vegamag', bandpass)
-        elif model.lower()=='cond':
-            table = cond_table(age)
-            mass_arr, mag_arr = cond_filter(table, filt, dist=dist)
-            mag = np.interp(mass, mass_arr, mag_arr)
-            mag += del_mag  # Apply extinction and/or accretion offsets
+        elif model.lower() in ['bex', 'cond']:
+            mag_table = _companion_mag_table(model.lower(), filt, age, dist)
+            # Apply extinction and/or accretion offsets
+            mag = _interp_mass_mag(mass, *mag_table) + del_mag
             renorm_args = (mag, 'vegamag', bandpass)
             
         # Renormalize to some specified flux in a given bandpass
         if (renorm_args is not None) and (len(renorm_args) > 0):
-            sp_norm = sp.renorm(*renorm_args, force=True)
-            sp = sp_norm
+            sp = sp.renorm(*renorm_args, force=True)
         elif sp_overlap != 'full':
-            _log.warning(f"Overlap between spectrum and bandpass: {sp_overlap}.")
-            _log.warning("Recommend supplying renorm_args input.")
+            _warn_overlap_once(bandpass, sp_overlap, "Recommend supplying renorm_args input.")
    
     elif model.lower() in ['bosz', 'ck04models', 'phoenix']:
         if sptype is None:
@@ -2567,13 +2960,18 @@ def companion_spec(bandpass, model='SB12', atmo='hy3s', mass=10, age=100, entrop
             sptype = 'flat'
             
         pl = {'sptype': sptype, 'Av': Av, 'renorm_args': renorm_args}
-        sp = stellar_spectrum(sptype)
-        if Av>0: 
-            Rv = 4.0  
-            sp *= s_ext.Extinction(Av/Rv, name='mwrv4')
-        if (renorm_args is not None) and (len(renorm_args) > 0):
-            sp_norm = sp.renorm(*renorm_args, force=True)
-            sp = sp_norm
+        if _is_mag_renorm(renorm_args):
+            # Magnitude renormalization is a scalar rescale of a cached 
+            # spectrum normalized to 0 mag in the same bandpass
+            mag, mag_units, bp = renorm_args
+            sp = _stellar_spectrum_mag0(sptype, Av, mag_units.lower(), bp)
+            sp = sp * 10**(-0.4 * mag)
+        else:
+            sp = stellar_spectrum(sptype)
+            if Av>0: 
+                sp *= _extinction_mwrv4(Av)
+            if (renorm_args is not None) and (len(renorm_args) > 0):
+                sp = sp.renorm(*renorm_args, force=True)
             
     name = kwargs.get('name')
     if name is not None:
@@ -2581,7 +2979,29 @@ def companion_spec(bandpass, model='SB12', atmo='hy3s', mass=10, age=100, entrop
         
     return sp
 
-def bin_spectrum(sp, wave, waveunits='um'):
+def _bin_mean(x, values, edges):
+    """Mean of values within each bin for monotonically increasing x
+
+    Bins are [edges[i], edges[i+1]), except the last bin, which also 
+    includes its right edge. Empty bins are set to NaN.
+    """
+
+    # Index ranges of x within each bin
+    i1 = np.searchsorted(x, edges[:-1], side='left')
+    iend = np.searchsorted(x, edges[-1], side='right')
+    counts = np.diff(np.append(i1, iend))
+
+    # Pad with a trailing zero so every start index is valid for reduceat
+    vals = np.concatenate([values[:iend], np.zeros(1, dtype=values.dtype)])
+    sums = np.add.reduceat(vals, i1)
+
+    binvals = np.full(len(counts), np.nan, dtype=sums.dtype)
+    ind = counts > 0
+    binvals[ind] = sums[ind] / counts[ind]
+
+    return binvals
+
+def bin_spectrum(sp, wave, waveunits='um', dtype=np.float64):
     """Rebin spectrum
 
     Rebin a synphot spectrum to a different wavelength grid.
@@ -2599,6 +3019,10 @@ def bin_spectrum(sp, wave, waveunits='um'):
         Wavelength grid to rebin onto.
     waveunits : str
         Units of wave input. Must be recognizeable by synphot.
+    dtype : data-type
+        Precision of binning arithmetic. Setting to `np.float32` 
+        reduces memory traffic for very long spectra. Output is 
+        always returned in float64.
 
     Returns
     -------
@@ -2606,49 +3030,74 @@ def bin_spectrum(sp, wave, waveunits='um'):
         Rebinned spectrum in same units as input spectrum.
     """
 
-    from .maths import binned_statistic
-    from synphot.binning import calculate_bin_edges
-
-    waveunits0 = sp.waveunits
-    fluxunits0 = sp.fluxunits
-
-    # Convert wavelength of input spectrum to desired output units
-    sp.convert(waveunits)
-    # We also want input to be in terms of counts to conserve flux
-    sp.convert('photlam')
-
-    # Calculate bin edges
-    edges = calculate_bin_edges(wave * sp.waveunits)
-    ind = (sp.waveset >= edges[0]) & (sp.waveset <= edges[-1])
-    binflux = binned_statistic(sp.wave[ind], sp.flux[ind], np.mean, bins=edges)
+    wave = np.asarray(wave, dtype=np.float64)
+    waveunits = s_ext.validate_unit(waveunits)
+
+    # Sample input spectrum in desired wavelength units. We also want
+    # flux in terms of counts (photlam) to conserve flux. The input 
+    # spectrum object itself is left unmodified.
+    waveset = sp.waveset
+    sp_wave = waveset.to_value(waveunits)
+    sp_flux = sp(waveset).to_value('photlam')
+
+    # Calculate bin edges at midpoints; first and last bins are 
+    # symmetric about their centers (same as synphot calculate_bin_edges)
+    edges = np.empty(wave.size + 1)
+    edges[1:-1] = 0.5 * (wave[1:] + wave[:-1])
+    edges[0] = 2.0 * wave[0] - edges[1]
+    edges[-1] = 2.0 * wave[-1] - edges[-2]
+
+    # Waveset is sorted, so grab contiguous slice within edges
+    i1 = np.searchsorted(sp_wave, edges[0], side='left')
+    i2 = np.searchsorted(sp_wave, edges[-1], side='right')
+    w_sub, f_sub = sp_wave[i1:i2], sp_flux[i1:i2]
+    if dtype != np.float64:
+        w_sub = w_sub.astype(dtype, copy=False)
+        f_sub = f_sub.astype(dtype, copy=False)
+        edges_bin = edges.astype(dtype)
+    else:
+        edges_bin = edges
+    binflux = _bin_mean(w_sub, f_sub, edges_bin).astype(np.float64, copy=False)
 
-    # Interpolate over NaNs
+    # Interpolate over NaNs (typically only a few empty bins)
     ind_nan = np.isnan(binflux)
-    finterp = interp1d(wave[~ind_nan], binflux[~ind_nan], kind='cubic')
-    binflux[ind_nan] = finterp(wave[ind_nan])
+    if ind_nan.any():
+        binflux[ind_nan] = np.interp(wave[ind_nan], wave[~ind_nan], binflux[~ind_nan])
 
     sp2 = s_ext.ArraySpectrum(wave, binflux, waveunits=waveunits, fluxunits='photlam')
-    sp2.convert(waveunits0)
-    sp2.convert(fluxunits0)
-
-    # Put back units of original input spectrum
-    sp.convert(waveunits0)
-    sp.convert(fluxunits0)
+    sp2.convert(sp.waveunits)
+    sp2.convert(sp.fluxunits)
 
     return sp2
 
+def _zp_counts(sp_type, bandpass, mag_units):
+    """Count rate (e-/sec) of a 0 magnitude star in a given bandpass
+
+    Cached on spectral type, bandpass name and throughput, and magnitude units.
+    """
+    return _zp_counts_cached(sp_type, _BandpassKey(bandpass), mag_units)
+
+@functools.lru_cache(maxsize=128)
+def _zp_counts_cached(sp_type, bp_key, mag_units):
+    bandpass = bp_key.bandpass
+    sp = _stellar_model(sp_type).renorm(0, mag_units, bandpass)
+    obs = s_ext.Observation(sp, bandpass, binset=bandpass.wave)
+    return obs.effstim('counts')
+
 def mag_to_counts(src_mag, bandpass, sp_type='G0V', mag_units='vegamag', **kwargs):
         """
         Convert stellar magnitudes in some bandpass to corresponding flux values (e-/sec)
+
+        `src_mag` can be a single value or an array of magnitudes. The
+        zero-point flux is cached for each (sp_type, bandpass, mag_units).
         """
         
         # Get flux of a 0 magnitude star (zero-point flux)
-        sp = stellar_spectrum(sp_type, 0, mag_units, bandpass)
-        obs = s_ext.Observation(sp, bandpass, binset=bandpass.wave)
-        zp_counts = obs.effstim('counts') # Counts of a 0 mag star
+        zp_counts = _zp_counts(sp_type, bandpass, mag_units)
         
         # Flux of each star e-/sec
-        src_flux = np.array(zp_counts * 10**(-src_mag / 2.5))
+        src_mag = np.asarray(src_mag, dtype=np.float64)
+        src_flux = np.array(zp_counts * np.exp(-_MAG_LN10_OVER_2P5 * src_mag))
         
         return src_flux
 
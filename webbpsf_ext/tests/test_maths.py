@@ -0,0 +1,70 @@
+import pytest
+
+import numpy as np
+from numpy.polynomial import polynomial, legendre
+from scipy.special import eval_legendre
+
+from webbpsf_ext.maths import jl_poly, jl_poly_fit, _legendre_basis
+
+@pytest.mark.parametrize("xval", [2.0, np.float64(2.0), np.array(2.0), [2.0], np.array([2.0])])
+def test_jl_poly_single_value(xval):
+    """Scalars, 0-d arrays, and length-1 inputs evaluate to a length-1 result"""
+    res = jl_poly(xval, [1,2,3])
+    assert np.allclose(res, [17.])
+
+def test_jl_poly_powers():
+    """Power series evaluation matches numpy for a coefficient cube"""
+    rng = np.random.default_rng(0)
+    xvals = np.linspace(-2, 3, 11)
+    coeff = rng.normal(size=(4,5,6))
+
+    res = jl_poly(xvals, coeff)
+    # polyval returns shape (5,6,nx); jl_poly is ordered (nx,5,6)
+    res_np = np.moveaxis(polynomial.polyval(xvals, coeff), -1, 0)
+
+    assert res.shape == (xvals.size, 5, 6)
+    assert np.allclose(res, res_np)
+
+@pytest.mark.parametrize("ncoeff", [1, 2, 5, 8, 10, 16, 31])
+def test_legendre_basis(ncoeff):
+    """Recurrence-based Legendre basis matches scipy over [-1,+1]"""
+    lxvals = np.linspace(-1, 1, 501)
+    xfan = _legendre_basis(lxvals, ncoeff)
+    xfan_sp = np.asarray([eval_legendre(n, lxvals) for n in range(ncoeff)])
+
+    assert xfan.shape == (ncoeff, lxvals.size)
+    assert np.allclose(xfan, xfan_sp, rtol=0, atol=1e-12)
+
+def test_legendre_basis_scalar():
+    """0-d inputs are treated as a single value"""
+    for lx in [0.3, np.float64(0.3), np.array(0.3)]:
+        xfan = _legendre_basis(lx, 4)
+        assert xfan.shape == (4, 1)
+        assert np.allclose(xfan[:,0], [eval_legendre(n, 0.3) for n in range(4)])
+
+def test_jl_poly_legendre():
+    """Legendre evaluation with remapped x-values matches numpy's legval"""
+    rng = np.random.default_rng(1)
+    lxmap = [2.4, 4.1]
+    xvals = np.linspace(2.4, 4.1, 17)
+    coeff = rng.normal(size=(9,4,3))
+
+    res = jl_poly(xvals, coeff, use_legendre=True, lxmap=lxmap)
+    lxvals = 2 * (xvals - np.mean(lxmap)) / (lxmap[1] - lxmap[0])
+    res_np = np.moveaxis(legendre.legval(lxvals, coeff), -1, 0)
+    assert np.allclose(res, res_np)
+
+    # Single 0-d value
+    res1 = jl_poly(np.float64(3.0), coeff[:,0,0], use_legendre=True, lxmap=lxmap)
+    assert np.allclose(res1, legendre.legval(2 * (3.0 - np.mean(lxmap)) / 1.7, coeff[:,0,0]))
+
+def test_jl_poly_fit_legendre():
+    """Legendre fit recovers the coefficients of a noiseless cube"""
+    rng = np.random.default_rng(2)
+    lxmap = [2.4, 4.1]
+    xvals = np.linspace(2.4, 4.1, 25)
+    coeff = rng.normal(size=(6,5,5))
+
+    yvals = jl_poly(xvals, coeff, use_legendre=True, lxmap=lxmap)
+    cf_fit = jl_poly_fit(xvals, yvals, deg=5, use_legendre=True, lxmap=lxmap)
+    assert np.allclose(cf_fit, coeff)
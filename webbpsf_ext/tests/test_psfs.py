@@ -0,0 +1,51 @@
+import pytest
+
+import numpy as np
+from types import SimpleNamespace
+
+from webbpsf_ext.psfs import gen_image_from_coeff
+from webbpsf_ext.bandpasses import nircam_filter
+
+def _synthetic_coeffs(nfield=3, ncoeff=10, fov_pix=8, osamp=2, dtype='float64'):
+    """Small random coefficient cube and the header entries needed to evaluate it"""
+    bp = nircam_filter('F335M')
+    inst = SimpleNamespace(name='NIRCam', is_grism=False, bandpass=bp)
+
+    w = bp.waveset.to_value('um')
+    hdr = {'LEGNDR': True, 'WAVE1': w.min(), 'WAVE2': w.max(),
+           'FOVPIX': fov_pix, 'OSAMP': osamp}
+
+    rng = np.random.default_rng(1234)
+    npix = fov_pix * osamp
+    coeff = rng.uniform(0.1, 1, size=(nfield, ncoeff, npix, npix)).astype(dtype)
+    # Zeroth-order term dominates to keep images positive
+    coeff[:,0] += 10
+
+    return inst, coeff, hdr
+
+@pytest.mark.parametrize("nfield, ncoeff", [(3,10), (10,10), (2,6)])
+@pytest.mark.parametrize("return_oversample", [True, False])
+def test_gen_image_from_coeff_fields(nfield, ncoeff, return_oversample):
+    """Batched field-point cube matches evaluating each field point separately"""
+
+    inst, coeff, hdr = _synthetic_coeffs(nfield=nfield, ncoeff=ncoeff)
+
+    res = gen_image_from_coeff(inst, coeff, hdr, return_oversample=return_oversample)
+    res_loop = [gen_image_from_coeff(inst, cf, hdr, return_oversample=return_oversample)
+                for cf in coeff]
+
+    assert res.shape == (nfield,) + res_loop[0].shape
+    assert np.allclose(res, np.asarray(res_loop))
+
+@pytest.mark.parametrize("dtype", ['float32', 'float64'])
+def test_gen_image_from_coeff_fields_dtype(dtype):
+    """Batched field-point evaluation keeps the coefficient precision"""
+
+    inst, coeff, hdr = _synthetic_coeffs(nfield=4, ncoeff=9, dtype=dtype)
+
+    res = gen_image_from_coeff(inst, coeff, hdr, return_oversample=True)
+    res_loop = np.asarray([gen_image_from_coeff(inst, cf, hdr, return_oversample=True) 
+                           for cf in coeff])
+
+    assert res.dtype == np.dtype(dtype)
+    assert np.allclose(res, res_loop, rtol=1e-5)
@@ -140,3 +140,98 @@ def test_coron_psfs(xidl, yidl, nrc_coron_coeffs_cached):
     print("Min/Max:", np.min(diff), np.max(diff))
 
     assert np.allclose(arr1, arr2, atol=0.001)
+
+def test_coron_sgd_coeffs(nrc_coron_coeffs_cached):
+    """Small grid dither PSFs from coefficients match one-at-a-time evaluation"""
+
+    nrc = nrc_coron_coeffs_cached
+
+    # 5-point cross SGD pattern (arcsec)
+    xoff = np.array([0, -0.015, 0.015, 0, 0])
+    yoff = np.array([0, 0, 0, -0.015, 0.015])
+
+    # Batched evaluation (default) and field point loop
+    hdul1 = nrc.calc_psfs_sgd(xoff, yoff, use_coeff=True, sp=sp_vega, return_oversample=False)
+    hdul2 = nrc.calc_psfs_sgd(xoff, yoff, use_coeff=True, sp=sp_vega, return_oversample=False,
+                              break_iter=True)
+
+    assert len(hdul1) == len(xoff)
+    assert len(hdul2) == len(xoff)
+    for ii, (xv, yv) in enumerate(zip(xoff, yoff)):
+        psf = nrc.calc_psf_from_coeff(sp=sp_vega, return_oversample=False,
+                                      coord_vals=(xv,yv), coord_frame='idl')
+        assert hdul1[ii].header['XVAL'] == xv
+        assert hdul1[ii].header['YVAL'] == yv
+        assert np.allclose(hdul1[ii].data, psf[0].data)
+        assert np.allclose(hdul2[ii].data, psf[0].data)
+
+
+def _gauss_psfs(wvals, npix=16):
+    """Normalized Gaussian 'PSFs' with width proportional to wavelength"""
+    from types import SimpleNamespace
+    yy, xx = np.mgrid[0:npix,0:npix] - npix/2
+    hdus = []
+    for w in wvals:
+        im = np.exp(-0.5 * (xx**2 + yy**2) / (0.8*w)**2)
+        hdus.append(SimpleNamespace(data=im/im.sum()))
+    return hdus
+
+def test_adaptive_wave_grid():
+    """Adaptive wavelength sampling converges and respects the PSF budget"""
+    from webbpsf_ext.webbpsf_ext_core import _adaptive_wave_grid
+    from webbpsf_ext.maths import jl_poly, jl_poly_fit
+
+    w1, w2, ndeg = 2.4, 4.1, 5
+    lxmap = [w1, w2]
+
+    # Converges before reaching the budget: initial ndeg+2 plus one round of midpoints
+    waves, hdus = _adaptive_wave_grid(_gauss_psfs, w1, w2, ndeg, 40, 1e-6)
+    assert len(waves) == len(hdus) == 2*ndeg + 3
+    assert np.all(np.diff(waves) > 0)
+
+    # Fit from the adaptive grid reproduces PSFs across the band
+    images = np.asarray([hdu.data for hdu in hdus])
+    cf = jl_poly_fit(waves, images, deg=ndeg, use_legendre=True, lxmap=lxmap)
+    wtest = np.linspace(w1, w2, 51)
+    im_test = np.asarray([hdu.data for hdu in _gauss_psfs(wtest)])
+    im_fit = jl_poly(wtest, cf, use_legendre=True, lxmap=lxmap)
+    resid_rms = np.sqrt(np.mean((im_test - im_fit)**2, axis=(1,2)))
+    assert resid_rms.max() < 1e-6
+
+    # Unreachable tolerance uses exactly the budget, and every computed PSF is kept
+    waves, hdus = _adaptive_wave_grid(_gauss_psfs, w1, w2, ndeg, 10, 1e-12)
+    assert len(waves) == len(hdus) == 10
+    for w, hdu in zip(waves, hdus):
+        assert np.allclose(hdu.data, _gauss_psfs([w])[0].data)
+
+    # Limited budget refines across the whole band rather than only the blue end
+    wnew = np.setdiff1d(waves, np.linspace(w1, w2, ndeg+2))
+    assert wnew.min() < w1 + 0.25*(w2-w1)
+    assert wnew.max() > w2 - 0.25*(w2-w1)
+
+def test_wfemask_checkpoint(tmp_path):
+    """Mask offset checkpoints are written atomically and bad files are recomputed"""
+    from types import SimpleNamespace
+    from webbpsf_ext.webbpsf_ext_core import _wfemask_psf_coeff
+
+    ncalls = []
+    def gen_psf_coeff(**kwargs):
+        ncalls.append(1)
+        return np.arange(24.).reshape([2,3,4]), None
+    inst = SimpleNamespace(gen_psf_coeff=gen_psf_coeff)
+
+    cf = _wfemask_psf_coeff(inst, 0.1, -0.2, ckpt_dir=tmp_path)
+    assert [p.suffix for p in tmp_path.iterdir()] == ['.npy']
+
+    # Resume loads the checkpoint without recomputing
+    cf2 = _wfemask_psf_coeff(inst, 0.1, -0.2, ckpt_dir=tmp_path)
+    assert len(ncalls) == 1
+    assert np.array_equal(cf, cf2)
+
+    # Truncated checkpoint (e.g., killed mid-write) is recomputed and replaced
+    fname = next(tmp_path.iterdir())
+    fname.write_bytes(fname.read_bytes()[:100])
+    cf3 = _wfemask_psf_coeff(inst, 0.1, -0.2, ckpt_dir=tmp_path)
+    assert len(ncalls) == 2
+    assert np.array_equal(cf, cf3)
+    assert np.array_equal(np.load(fname), cf)
@@ -1,5 +1,6 @@
 # Import libraries
 from copy import deepcopy
+import functools
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
@@ -67,6 +68,16 @@ def check_fitsgz(opd_file, inst_str=None):
         opd_dir = get_stpsf_data_path()
     else:
         opd_dir = os.path.join(get_stpsf_data_path(),inst_str,'OPD')
+
+    return _resolve_fitsgz(opd_dir, opd_file)
+
+@functools.lru_cache(maxsize=32)
+def _resolve_fitsgz(opd_dir, opd_file):
+    """Find `opd_file` or its .gz counterpart in `opd_dir`
+
+    Cached so repeated instrument instantiations don't probe the file system
+    each time. Failed lookups raise and are therefore not cached.
+    """
     opd_fullpath = os.path.join(opd_dir, opd_file)
 
     # Check if file exists 
@@ -1,26 +1,28 @@
 # Import libraries
 from operator import add
 import numpy as np
-import matplotlib.pyplot as plt
 
 import time
 import os, six
+import functools
 from pathlib import Path
 
-import multiprocessing as mp
 import traceback
+import atexit
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 
 from astropy.io import fits
 from astropy.table import Table
 import astropy.units as u
 
-from copy import deepcopy
+from copy import copy, deepcopy
 
 # Bandpasses, PSFs, and OPDs
 from .bandpasses import miri_filter, nircam_filter
 from .psfs import nproc_use, gen_image_from_coeff
 from .psfs import make_coeff_resid_grid, field_coeff_func
-from .opds import OPDFile_to_HDUList
+from .opds import OPDFile_to_HDUList, OPDFile_npix
 from .spectra import stellar_spectrum
 
 # Coordinates and image manipulation
@@ -51,6 +53,12 @@ from stpsf.opds import OTE_Linear_Model_WSS
 # Program bar
 from tqdm.auto import trange, tqdm
 
+# Bit flags for pupil and image mask types
+_MASK_LYOT  = 1 << 0
+_MASK_GRISM = 1 << 1
+_MASK_FLAT  = 1 << 2
+_MASK_IMAGE = 1 << 3
+
 # NIRCam Subclass
 class NIRCam_ext(stpsf_NIRCam):
 
@@ -61,6 +69,11 @@ class NIRCam_ext(stpsf_NIRCam):
     as WFE variations due to field-dependent OPDs and telescope thermal drifts.
     """
 
+    # (detector, (scaid, fastaxis, slowaxis)) from last lookup
+    _sca_info_cache = ('', None)
+    # ((pupil_mask, image_mask), flags) from last lookup
+    _mask_flags_cache = ('', 0)
+
     def __init__(self, filter=None, pupil_mask=None, image_mask=None, 
                  fov_pix=None, oversample=None, **kwargs):
         """Initialize NIRCam instrument
@@ -101,6 +114,15 @@ class NIRCam_ext(stpsf_NIRCam):
             Maximum allowed size for coefficient modifications due to field point
             variations such as distortion. Default is 128. Any pixels beyond this 
             size will be considered to have 0 residual difference
+        coeff_dtype : numpy dtype
+            Floating point precision for storing and evaluating PSF coefficients
+            and their WFE drift, field, and mask modifications. Use `np.float32` 
+            to halve memory usage. Default is `np.float64`. Other precisions
+            are saved to separate coefficient files tagged with the dtype name.
+        chebyshev_nodes : bool
+            Sample monochromatic PSFs at Chebyshev nodes across the fit wavelength
+            range rather than evenly spaced wavelengths. Coefficients are saved
+            to separate files tagged with '_cheb'. Default is False.
         """
 
         stpsf_NIRCam.__init__(self)
@@ -127,6 +149,8 @@ class NIRCam_ext(stpsf_NIRCam):
             'A1':481, 'A2':482, 'A3':483, 'A4':484, 'A5':485,
             'B1':486, 'B2':487, 'B3':488, 'B4':489, 'B5':490,
         }
+        # SCA ID to detector name
+        self._sca2det = {v: k for k, v in self._det2sca.items()}
 
         # Option to use 1st or 2nd order for grism bandpasses
         self._grism_order = 1
@@ -170,24 +194,38 @@ class NIRCam_ext(stpsf_NIRCam):
     def save_name(self, value):
         self._save_name = value
 
+    def _mask_flags(self):
+        """Cached bit flags describing the current pupil and image masks"""
+        # Keyed on the underlying mask names, which STPSF may set directly
+        masks = (self._pupil_mask, self._image_mask)
+        masks_cached, flags = self._mask_flags_cache
+        if masks_cached != masks:
+            pupil, mask = masks
+            flags = 0
+            if pupil is not None:
+                flags |= _MASK_LYOT  if 'LYOT'  in pupil else 0
+                flags |= _MASK_GRISM if 'GRISM' in pupil else 0
+                flags |= _MASK_FLAT  if 'FLAT'  in pupil else 0
+            if mask is not None:
+                flags |= _MASK_IMAGE if 'MASK'  in mask  else 0
+            self._mask_flags_cache = (masks, flags)
+        return flags
+
     @property
     def is_lyot(self):
         """Is a Lyot mask in the pupil wheel?"""
-        pupil = self.pupil_mask
-        return (pupil is not None) and ('LYOT' in pupil)
+        return bool(self._mask_flags() & _MASK_LYOT)
     @property
     def is_coron(self):
         """Observation with coronagraphic mask (incl Lyot stop)?"""
-        mask = self.image_mask
-        return self.is_lyot and ((mask is not None) and ('MASK' in mask))
+        flags = self._mask_flags()
+        return bool(flags & _MASK_LYOT) and bool(flags & _MASK_IMAGE)
     @property
     def is_grism(self):
-        pupil = self.pupil_mask
-        return (pupil is not None) and ('GRISM' in pupil)
+        return bool(self._mask_flags() & _MASK_GRISM)
     @property
     def is_dark(self):
-        pupil = self.pupil_mask
-        return (pupil is not None) and ('FLAT' in pupil)
+        return bool(self._mask_flags() & _MASK_FLAT)
 
     @property
     def ND_acq(self):
@@ -243,10 +281,7 @@ class NIRCam_ext(stpsf_NIRCam):
         same data twice.
         """
         if self._use_fov_pix_plus1 is None:
-            if np.mod(self.oversample, 2)==0 and np.mod(self.fov_pix, 2)==0:
-                use_fov_pix_plus1 = True 
-            else: 
-                use_fov_pix_plus1 = False
+            use_fov_pix_plus1 = (self.oversample % 2 == 0) and (self.fov_pix % 2 == 0)
         else:
             use_fov_pix_plus1 = self._use_fov_pix_plus1
         return use_fov_pix_plus1
@@ -345,20 +380,38 @@ class NIRCam_ext(stpsf_NIRCam):
     def siaf_ap(self, value):
         self._siaf_ap = value
 
+    def _sca_info(self):
+        """Cached (scaid, fastaxis, slowaxis) for current detector"""
+        # STPSF updates `_detector` directly in some places (e.g., filter
+        # changes between channels), so key the cache on its value
+        detector = self._detector
+        det_cached, info = self._sca_info_cache
+        if det_cached != detector:
+            scaid = self._det2sca.get(detector[-2:], 'unknown')
+            # https://jwst-pipeline.readthedocs.io/en/latest/jwst/references_general/references_general.html#orientation-of-detector-image
+            # 481, 3, 5, 7, 9 have fastaxis equal -1 and slowaxis equal +2
+            # Others have fastaxis equal +1 and slowaxis equal -2
+            if scaid == 'unknown':
+                fastaxis = slowaxis = None
+            elif scaid % 2 == 1:
+                fastaxis, slowaxis = -1, +2
+            else:
+                fastaxis, slowaxis = +1, -2
+            info = (scaid, fastaxis, slowaxis)
+            self._sca_info_cache = (detector, info)
+        return info
+
     @property
     def scaid(self):
         """SCA ID (481, 482, ... 489, 490)"""
-        detid = self.detector[-2:]
-        return self._det2sca.get(detid, 'unknown')
+        return self._sca_info()[0]
     @scaid.setter
     def scaid(self, value):
-        scaid_values = np.array(list(self._det2sca.values()))
-        det_values = np.array(list(self._det2sca.keys()))
-        if value in scaid_values:
-            ind = np.where(scaid_values==value)[0][0]
-            self.detector = 'NRC'+det_values[ind]
+        det = self._sca2det.get(value)
+        if det is not None:
+            self.detector = 'NRC'+det
         else:
-            _check_list(value, scaid_values, var_name='scaid')
+            _check_list(value, list(self._sca2det.keys()), var_name='scaid')
 
 
     @stpsf_NIRCam.detector_position.setter
@@ -366,7 +419,8 @@ class NIRCam_ext(stpsf_NIRCam):
         # Remove limits for detector position
         # Values outside of [0,2047] will get transformed to the correct V2/V3 location
         try:
-            x, y = map(float, position)
+            x, y = position
+            x, y = float(x), float(y)
         except ValueError:
             raise ValueError("Detector pixel coordinates must be a pair of numbers, not {}".format(position))
         self._detector_position = (x,y)
@@ -383,19 +437,11 @@ class NIRCam_ext(stpsf_NIRCam):
     @property
     def fastaxis(self):
         """Fast readout direction in sci coords"""
-        # https://jwst-pipeline.readthedocs.io/en/latest/jwst/references_general/references_general.html#orientation-of-detector-image
-        # 481, 3, 5, 7, 9 have fastaxis equal -1
-        # Others have fastaxis equal +1
-        fastaxis = -1 if np.mod(self.scaid,2)==1 else +1
-        return fastaxis
+        return self._sca_info()[1]
     @property
     def slowaxis(self):
         """Slow readout direction in sci coords"""
-        # https://jwst-pipeline.readthedocs.io/en/latest/jwst/references_general/references_general.html#orientation-of-detector-image
-        # 481, 3, 5, 7, 9 have slowaxis equal +2
-        # Others have slowaxis equal -2
-        slowaxis = +2 if np.mod(self.scaid,2)==1 else -2
-        return slowaxis
+        return self._sca_info()[2]
 
     @property
     def bandpass(self):
@@ -428,7 +474,9 @@ class NIRCam_ext(stpsf_NIRCam):
         kwargs['module'] = self.module
         kwargs['sca'] = self.detector
 
-        bp = nircam_filter(self.filter, **kwargs)
+        # Throughput is cached for a given set of inputs; return a 
+        # copy so that modifications do not affect the cache
+        bp = deepcopy(_nircam_filter_cached(self.filter, **kwargs))
         
         return bp
     
@@ -466,7 +514,7 @@ class NIRCam_ext(stpsf_NIRCam):
 
         # For NIRCam, update detector depending mask and filter
         if self.is_coron and self.name=='NIRCam':
-            bp = nircam_filter(self.filter)
+            bp = _nircam_filter_cached(self.filter)
             avgwave = bp.avgwave().to_value('um')
 
             # SW Observations
@@ -575,8 +623,6 @@ class NIRCam_ext(stpsf_NIRCam):
             Size of output pixels in units of arcsec. If not specified,
             then selects oversample pixel scale.
         """
-        
-        from stpsf.optics import NIRCam_BandLimitedCoron
 
         shifts = {'shift_x': self.options.get('coron_shift_x', None),
                   'shift_y': self.options.get('coron_shift_y', None)}
@@ -593,13 +639,13 @@ class NIRCam_ext(stpsf_NIRCam):
                 bar_offset = self.get_bar_offset() if bar_offset is None else bar_offset
             else:
                 bar_offset = None
-            mask = NIRCam_BandLimitedCoron(name=self.image_mask, module=self.module, nd_squares=nd_squares,
-                                           bar_offset=bar_offset, auto_offset=None, **shifts)
-
-            # Create wavefront to pass through mask and obtain transmission image
-            wavelength = self.bandpass.avgwave().to('m')
-            wave = poppy.Wavefront(wavelength=wavelength, npix=npix, pixelscale=pixelscale)
-            im = mask.get_transmission(wave)**2
+            # Transmission depends only on mask geometry and sampling; 
+            # return a copy so that modifications do not affect the cache
+            wavelength = self.bandpass.avgwave().to('m').value
+            im = _nircam_mask_image(self.image_mask, self.module, bar_offset, 
+                                    shifts['shift_x'], shifts['shift_y'], int(npix), 
+                                    float(pixelscale), bool(nd_squares), float(wavelength))
+            im = im.copy()
         else:
             im = np.ones([npix,npix])
 
@@ -680,6 +726,28 @@ class NIRCam_ext(stpsf_NIRCam):
         """
         return _gen_save_name(self, wfe_drift=wfe_drift)
 
+    @contextmanager
+    def _temp_option(self, key, value):
+        """Temporarily set `self.options[key]`, restoring it on exit"""
+        value_orig = self.options.get(key, None)
+        self.options[key] = value
+        try:
+            yield
+        finally:
+            self.options[key] = value_orig
+
+    @contextmanager
+    def _with_bar_offset(self):
+        """Temporarily set bar offset to the value stored in `psf_coeff_header`"""
+        try:
+            bar_offset = self.psf_coeff_header.get('BAROFF', None)
+        except AttributeError:
+            # Throws error if psf_coeff_header doesn't exist
+            _log.error("psf_coeff_header does not appear to exist. Run gen_psf_coeff().")
+            raise
+        with self._temp_option('bar_offset', bar_offset):
+            yield
+
     def gen_psf_coeff(self, bar_offset=0, **kwargs):
         """Generate PSF coefficients
 
@@ -731,13 +799,15 @@ class NIRCam_ext(stpsf_NIRCam):
             `return_results`. If `return_results=False`, then only this dictionary is
             returned, otherwise if `return_results=True` then returns everything as a
             3-element tuple (psf_coeff, psf_coeff_header, extras_dict).
+        tolerance_rms : float or None
+            If set, adaptively choose the wavelengths of the monochromatic PSFs,
+            bisecting intervals where the polynomial fit residual RMS exceeds
+            this value. Number of PSFs is capped at `npsf`. (default: None)
         """
 
         # Set to input bar offset value. No effect if not a wedge mask.
-        bar_offset_orig = self.options.get('bar_offset', None)
-        self.options['bar_offset'] = bar_offset
-        res = _gen_psf_coeff(self, **kwargs)
-        self.options['bar_offset'] = bar_offset_orig
+        with self._temp_option('bar_offset', bar_offset):
+            res = _gen_psf_coeff(self, **kwargs)
 
         return res
 
@@ -778,20 +848,9 @@ class NIRCam_ext(stpsf_NIRCam):
             prior to fitting. Final results will not be saved to the dictionary attributes.
         """
 
-        # Set to input bar offset value. No effect if not a wedge mask.
-        bar_offset_orig = self.options.get('bar_offset', None)
-        try:
-            self.options['bar_offset'] = self.psf_coeff_header.get('BAROFF', None)
-        except AttributeError:
-            # Throws error if psf_coeff_header doesn't exist
-            _log.error("psf_coeff_header does not appear to exist. Run gen_psf_coeff().")
-            res = 0
-        else:
-            res = _gen_wfedrift_coeff(self, force=force, save=save, **kwargs)
-        finally:
-            self.options['bar_offset'] = bar_offset_orig
-
-        return res
+        # Set to bar offset used for PSF coefficients. No effect if not a wedge mask.
+        with self._with_bar_offset():
+            return _gen_wfedrift_coeff(self, force=force, save=save, **kwargs)
 
     def gen_wfemask_coeff(self, large_grid=True, force=False, save=True, **kwargs):
         """ Fit WFE changes in mask position
@@ -831,20 +890,9 @@ class NIRCam_ext(stpsf_NIRCam):
 
         """
 
-        # Set to input bar offset value. No effect if not a wedge mask.
-        bar_offset_orig = self.options.get('bar_offset', None)
-        try:
-            self.options['bar_offset'] = self.psf_coeff_header.get('BAROFF', None)
-        except AttributeError:
-            # Throws error if psf_coeff_header doesn't exist
-            _log.error("psf_coeff_header does not appear to exist. Run gen_psf_coeff().")
-            res = 0
-        else:
-            res = _gen_wfemask_coeff(self, large_grid=large_grid, force=force, save=save, **kwargs)
-        finally:
-            self.options['bar_offset'] = bar_offset_orig
-
-        return res
+        # Set to bar offset used for PSF coefficients. No effect if not a wedge mask.
+        with self._with_bar_offset():
+            return _gen_wfemask_coeff(self, large_grid=large_grid, force=force, save=save, **kwargs)
 
     def gen_wfefield_coeff(self, force=False, save=True, **kwargs):
         """ Fit WFE field-dependent coefficients
@@ -1065,6 +1113,9 @@ class NIRCam_ext(stpsf_NIRCam):
             ('det', 'sci', 'tel', 'idl'). Output is then xvals, yvals, hdul_psfs.
         use_coeff : bool
             If True, uses `calc_psf_from_coeff`, other STPSF's built-in `calc_psf`.
+        nproc : int
+            Number of processes used to compute PSF positions in parallel
+            when `use_coeff=False`. Default is 1.
         coron_rescale : bool
             Rescale off-axis coronagraphic PSF to better match analytic prediction
             when source overlaps coronagraphic occulting mask. Only valid for use_coeff=True.
@@ -1090,6 +1141,12 @@ class NIRCam_ext(stpsf_NIRCam):
             Offsets in y-direction (in 'idl' coordinates).
         use_coeff : bool
             If True, uses `calc_psf_from_coeff`, other STPSF's built-in `calc_psf`.
+
+        Keyword Args
+        ============
+        break_iter : bool
+            Passed to `calc_psf_from_coeff`. Defaults to False so that all SGD
+            positions are evaluated in a single batched pass.
         """
 
         res = _calc_psfs_sgd(self, xoff_asec, yoff_asec, use_coeff=use_coeff, **kwargs)
@@ -1144,6 +1201,15 @@ class MIRI_ext(stpsf_MIRI):
             Maximum allowed size for coefficient modifications due to field point
             variations such as distortion. Default is 128. Any pixels beyond this 
             size will be considered to have 0 residual difference
+        coeff_dtype : numpy dtype
+            Floating point precision for storing and evaluating PSF coefficients
+            and their WFE drift, field, and mask modifications. Use `np.float32` 
+            to halve memory usage. Default is `np.float64`. Other precisions
+            are saved to separate coefficient files tagged with the dtype name.
+        chebyshev_nodes : bool
+            Sample monochromatic PSFs at Chebyshev nodes across the fit wavelength
+            range rather than evenly spaced wavelengths. Coefficients are saved
+            to separate files tagged with '_cheb'. Default is False.
         """
         
         stpsf_MIRI.__init__(self)
@@ -1219,7 +1285,7 @@ class MIRI_ext(stpsf_MIRI):
         same data twice.
         """
         if self._use_fov_pix_plus1 is None:
-            use_fov_pix_plus1 = True if np.mod(self.oversample, 2)==0 else False
+            use_fov_pix_plus1 = (self.oversample % 2 == 0)
         else:
             use_fov_pix_plus1 = self._use_fov_pix_plus1
         return use_fov_pix_plus1
@@ -1231,8 +1297,10 @@ class MIRI_ext(stpsf_MIRI):
     def wave_fit(self):
         """Wavelength range to fit"""
         if self.quick:
-            w1 = self.bandpass.wave.min() / 1e4
-            w2 = self.bandpass.wave.max() / 1e4
+            # Read-only access, so skip the copy made by `self.bandpass`
+            wave = _miri_filter_cached(self.filter).wave
+            w1 = wave.min() / 1e4
+            w2 = wave.max() / 1e4
         else:
             w1, w2 = (5,30)
         return (w1, w2)
@@ -1304,7 +1372,8 @@ class MIRI_ext(stpsf_MIRI):
     @stpsf_MIRI.detector_position.setter
     def detector_position(self, position):
         try:
-            x, y = map(float, position)
+            x, y = position
+            x, y = float(x), float(y)
         except ValueError:
             raise ValueError("Detector pixel coordinates must be a pair of numbers, not {}".format(position))
         self._detector_position = (x,y)
@@ -1333,7 +1402,9 @@ class MIRI_ext(stpsf_MIRI):
 
     @property
     def bandpass(self):
-        return miri_filter(self.filter)
+        # Throughput is cached for each filter; return a 
+        # copy so that modifications do not affect the cache
+        return deepcopy(_miri_filter_cached(self.filter))
 
     def plot_bandpass(self, ax=None, color=None, title=None, 
                       return_ax=False, **kwargs):
@@ -1378,61 +1449,56 @@ class MIRI_ext(stpsf_MIRI):
             If set to False, then output mask is rotated along V2/V3 axes.
         """
         
-        def make_fqpm_wrapper(name, wavelength):
-            opticslist = [poppy.IdealFQPM(wavelength=wavelength, name=self.image_mask, rotation=rot1, **offsets),
-                          poppy.SquareFieldStop(size=24, rotation=rot2, **offsets)]
-            container = poppy.CompoundAnalyticOptic(name=name, opticslist=opticslist)
-            return container
-        
         rot1 = -1*self._rotation if detector_orientation else 0
         rot2 = 0 if detector_orientation else self._rotation
-        offsets = {'shift_x': self.options.get('coron_shift_x', None),
-                   'shift_y': self.options.get('coron_shift_y', None)}
+        shift_x = self.options.get('coron_shift_x', None)
+        shift_y = self.options.get('coron_shift_y', None)
         
         if pixelscale is None:
             pixelscale = self.pixelscale / self.oversample
 
-        if self.image_mask == 'FQPM1065':
-            full_pad = 2*np.max(np.abs(xy_rot(12, 12, rot2)))
-            npix = int(full_pad / pixelscale + 0.5) if npix is None else npix
-            wave = poppy.Wavefront(wavelength=10.65e-6, npix=npix, pixelscale=pixelscale)
-            mask = make_fqpm_wrapper("MIRI FQPM 1065", 10.65e-6)
-            im = np.real(mask.get_phasor(wave))
-            im /= im.max()
-        elif self.image_mask == 'FQPM1140':
-            full_pad = 2*np.max(np.abs(xy_rot(12, 12, rot2)))
-            npix = int(full_pad / pixelscale + 0.5) if npix is None else npix
-            wave = poppy.Wavefront(wavelength=11.4e-6, npix=npix, pixelscale=pixelscale)
-            mask = make_fqpm_wrapper("MIRI FQPM 1140", 11.40e-6)
-            im = np.real(mask.get_phasor(wave))
-            im /= im.max()
-        elif self.image_mask == 'FQPM1550':
-            full_pad = 2*np.max(np.abs(xy_rot(12, 12, rot2)))
-            npix = int(full_pad / pixelscale + 0.5) if npix is None else npix
-            wave = poppy.Wavefront(wavelength=15.5e-6, npix=npix, pixelscale=pixelscale)
-            mask = make_fqpm_wrapper("MIRI FQPM 1550", 15.50e-6)
-            im = np.real(mask.get_phasor(wave))
-            im /= im.max()
-        elif self.image_mask == 'LYOT2300':
-            full_pad = 2*np.max(np.abs(xy_rot(15, 15, rot2)))
-            npix = int(full_pad / pixelscale + 0.5) if npix is None else npix
-            wave = poppy.Wavefront(wavelength=23e-6, npix=npix, pixelscale=pixelscale)
-            opticslist = [poppy.CircularOcculter(radius=4.25 / 2, name=self.image_mask, rotation=rot1, **offsets),
-                          poppy.BarOcculter(width=0.722, height=31, rotation=rot1, **offsets),
-                          poppy.SquareFieldStop(size=30, rotation=rot2, **offsets)]
-            mask = poppy.CompoundAnalyticOptic(name="MIRI Lyot Occulter", opticslist=opticslist)
-            im = mask.get_transmission(wave)**2
-        elif self.image_mask == 'LRS slit':
-            full_pad = 2*np.max(np.abs(xy_rot(2.5, 2.5, rot2)))
-            npix = int(full_pad / pixelscale + 0.5) if npix is None else npix
-            wave = poppy.Wavefront(wavelength=23e-6, npix=npix, pixelscale=pixelscale)
-            mask = poppy.RectangularFieldStop(width=4.7, height=0.51, rotation=rot2, 
-                                              name=self.image_mask, **offsets)
-            im = mask.get_transmission(wave)**2
+        # Mask image is a pure function of these settings, so use cached 
+        # version and return a copy that can be safely modified
+        im = _miri_mask_image(self.image_mask, npix, pixelscale, rot1, rot2, 
+                              shift_x, shift_y)
+        return im.copy()
+
+    def gen_mask_images(self, pixelscales, detector_orientation=True):
+        """
+        Return image representations of the focal plane mask for a
+        series of pixel scales. Output sizes are determined from
+        the mask FoV, same as `gen_mask_image` with `npix=None`.
+
+        Parameters
+        ==========
+        pixelscales : array-like
+            Sizes of output pixels in units of arcsec.
+        detector_orientation : bool
+            Should the output images be rotated to be in detector coordinates?
+            If set to False, then output mask is rotated along V2/V3 axes.
+
+        Returns
+        =======
+        List of mask images, one per pixel scale.
+        """
+
+        rot1 = -1*self._rotation if detector_orientation else 0
+        rot2 = 0 if detector_orientation else self._rotation
+        shift_x = self.options.get('coron_shift_x', None)
+        shift_y = self.options.get('coron_shift_y', None)
+
+        # Image sizes for all pixel scales at once
+        pixelscales = np.atleast_1d(np.asarray(pixelscales, dtype=float))
+        half_extent = _MIRI_MASK_HALF_EXTENT.get(self.image_mask)
+        if half_extent is None:
+            npix_all = [None] * len(pixelscales)
         else:
-            im = np.ones([npix,npix])
-        
-        return im
+            full_pad = _full_pad(half_extent, rot2)
+            npix_all = np.floor(full_pad / pixelscales + 0.5).astype(int).tolist()
+
+        return [_miri_mask_image(self.image_mask, npix, float(pixelscale), rot1, rot2,
+                                 shift_x, shift_y).copy()
+                for npix, pixelscale in zip(npix_all, pixelscales)]
         
     def get_opd_info(self, opd=None, pupil=None, HDUL_to_OTELM=True):
         """
@@ -1797,6 +1863,9 @@ class MIRI_ext(stpsf_MIRI):
             ('det', 'sci', 'tel', 'idl'). Output is then xvals, yvals, hdul_psfs.
         use_coeff : bool
             If True, uses `calc_psf_from_coeff`, other STPSF's built-in `calc_psf`.
+        nproc : int
+            Number of processes used to compute PSF positions in parallel
+            when `use_coeff=False`. Default is 1.
         """
 
         res = _calc_psfs_grid(self, sp=sp, wfe_drift=wfe_drift, osamp=osamp, npsf_per_full_fov=npsf_per_full_fov,
@@ -1819,6 +1888,12 @@ class MIRI_ext(stpsf_MIRI):
             Offsets in y-direction (in 'idl' coordinates).
         use_coeff : bool
             If True, uses `calc_psf_from_coeff`, other STPSF's built-in `calc_psf`.
+
+        Keyword Args
+        ============
+        break_iter : bool
+            Passed to `calc_psf_from_coeff`. Defaults to False so that all SGD
+            positions are evaluated in a single batched pass.
         """
 
         res = _calc_psfs_sgd(self, xoff_asec, yoff_asec, use_coeff=use_coeff, **kwargs)
@@ -1835,10 +1910,8 @@ def _check_list(value, temp_list, var_name=None):
     This is mainly used for limiting the allowed values of some variable.
     """
     if value not in temp_list:
-        # Replace None value with string for printing
-        if None in temp_list: 
-            temp_list[temp_list.index(None)] = 'None'
-        # Make sure all elements are strings
+        # Make sure all elements are strings for printing
+        # (without modifying the caller's list)
         temp_list2 = [str(val) for val in temp_list]
         var_name = '' if var_name is None else var_name + ' '
         err_str = "Invalid {}setting: {} \n\tValid values are: {}" \
@@ -1846,12 +1919,182 @@ def _check_list(value, temp_list, var_name=None):
         raise ValueError(err_str)
 
 
+@functools.lru_cache(maxsize=32)
+def _nircam_filter_cached(filter, **kwargs):
+    """Cached call to `nircam_filter`; do not modify output in place"""
+    return nircam_filter(filter, **kwargs)
+
+@functools.lru_cache(maxsize=32)
+def _miri_filter_cached(filter, **kwargs):
+    """Cached call to `miri_filter`; do not modify output in place"""
+    return miri_filter(filter, **kwargs)
+
+
+@functools.lru_cache(maxsize=32)
+def _nircam_mask_image(image_mask, module, bar_offset, shift_x, shift_y, 
+                       npix, pixelscale, nd_squares, wavelength):
+    """Cached intensity transmission image of NIRCam coronagraph mask
+    
+    Wavelength is in meters. Do not modify output in place.
+    """
+    from stpsf.optics import NIRCam_BandLimitedCoron
+
+    mask = NIRCam_BandLimitedCoron(name=image_mask, module=module, nd_squares=nd_squares,
+                                   bar_offset=bar_offset, auto_offset=None, 
+                                   shift_x=shift_x, shift_y=shift_y)
+
+    # Pass wavefront through mask to obtain transmission image
+    wave = _get_mask_wavefront(wavelength, npix, pixelscale)
+    im = mask.get_transmission(wave)
+    np.square(im, out=im)
+    return im
+
+
+@functools.lru_cache(maxsize=4)
+def _mask_wavefront(npix, pixelscale):
+    """Cached image-plane `poppy.Wavefront` for mask transmission images"""
+    return poppy.Wavefront(npix=npix, pixelscale=pixelscale)
+
+def _get_mask_wavefront(wavelength, npix, pixelscale):
+    """Image-plane wavefront at `wavelength` (meters) for evaluating masks
+
+    Reuses the cached grid for a given `npix` and `pixelscale` and only 
+    updates the wavelength. Masks only read the wavefront coordinates.
+    """
+    wave = _mask_wavefront(npix, pixelscale)
+    wave.wavelength = wavelength * u.m
+    return wave
+
+
+@functools.lru_cache(maxsize=64)
+def _full_pad(half_extent, rot):
+    """Full width of a square field of `half_extent` rotated by `rot` degrees"""
+    xr, yr = xy_rot(half_extent, half_extent, rot)
+    return 2 * max(abs(float(xr)), abs(float(yr)))
+
+def _mask_coords(y, x, rot, shift_x=None, shift_y=None):
+    """Shift then rotate image-plane coordinates (arcsec), as in poppy optics"""
+    if shift_x is not None:
+        x = x - (shift_x.to_value(u.arcsec) if isinstance(shift_x, u.Quantity) else float(shift_x))
+    if shift_y is not None:
+        y = y - (shift_y.to_value(u.arcsec) if isinstance(shift_y, u.Quantity) else float(shift_y))
+    if rot:
+        angle = np.deg2rad(rot)
+        cs, sn = np.cos(angle), np.sin(angle)
+        x, y = cs*x + sn*y, -sn*x + cs*y
+    return y, x
+
+def _fqpm_image(npix, pixelscale, rot1, rot2, shift_x=None, shift_y=None, size=24):
+    """Real part of an ideal FQPM phasor behind a square field stop
+
+    Equivalent to `np.real` of `poppy.IdealFQPM` combined with `poppy.SquareFieldStop`
+    in a `poppy.CompoundAnalyticOptic` at the FQPM design wavelength, evaluated
+    directly on the image-plane grid. Phases are 0 or pi, so the result is +1 or -1
+    in alternating quadrants (0 along the quadrant boundaries).
+    """
+    yy, xx = _mask_wavefront(npix, pixelscale).coordinates()
+
+    # Quadrant phase pattern
+    y, x = _mask_coords(yy, xx, rot1, shift_x, shift_y)
+    im = np.sign(x) * np.sign(y)
+
+    # Square field stop
+    y, x = _mask_coords(yy, xx, rot2, shift_x, shift_y)
+    im[(np.abs(x) > size/2) | (np.abs(y) > size/2)] = 0
+
+    return im
+
+def _lrs_slit_image(npix, pixelscale, rot, shift_x=None, shift_y=None, width=4.7, height=0.51):
+    """Transmission of the MIRI LRS slit
+
+    Equivalent to `poppy.RectangularFieldStop` evaluated on the image-plane grid,
+    which is a simple 0/1 inequality on the rotated coordinates.
+    """
+    yy, xx = _mask_wavefront(npix, pixelscale).coordinates()
+    y, x = _mask_coords(yy, xx, rot, shift_x, shift_y)
+    inside = (np.abs(y) <= height/2) & (np.abs(x) <= width/2)
+    return inside.astype(float)
+
+@functools.lru_cache(maxsize=16)
+def _miri_mask_optic(image_mask, rot1, rot2, shift_x, shift_y):
+    """Cached poppy analytic optic for MIRI Lyot spot mask
+
+    Optics are pure functions of their geometry, so can be reused
+    for any image-plane wavefront.
+    """
+    offsets = {'shift_x': shift_x, 'shift_y': shift_y}
+    if image_mask == 'LYOT2300':
+        opticslist = [poppy.CircularOcculter(radius=4.25 / 2, name=image_mask, rotation=rot1, **offsets),
+                      poppy.BarOcculter(width=0.722, height=31, rotation=rot1, **offsets),
+                      poppy.SquareFieldStop(size=30, rotation=rot2, **offsets)]
+        return poppy.CompoundAnalyticOptic(name="MIRI Lyot Occulter", opticslist=opticslist)
+    else:
+        raise ValueError(f"No analytic optic defined for {image_mask}")
+
+# Half-width (arcsec) of MIRI field stop regions used to size mask images
+_MIRI_MASK_HALF_EXTENT = {
+    'FQPM1065': 12, 'FQPM1140': 12, 'FQPM1550': 12,
+    'LYOT2300': 15, 'LRS slit': 2.5,
+}
+
+@functools.lru_cache(maxsize=4)
+def _default_opd(data_path):
+    """Default OTE OPD file for a given STPSF data directory
+
+    Prefers the cycle 1 example OPD, falling back to the prelaunch
+    predicted OPD. Resolved once per data path rather than on every
+    instrument instantiation.
+    """
+    opd_name = 'JWST_OTE_OPD_cycle1_example_2022-07-30.fits'
+    try:
+        return check_fitsgz(opd_name)
+    except OSError:
+        opd_name = 'JWST_OTE_OPD_RevAA_prelaunch_predicted.fits'
+        opd_name = check_fitsgz(opd_name)
+        # opd_name = f'OPD_RevW_ote_for_{self.name}_predicted.fits'
+        # opd_name = check_fitsgz(opd_name, self.name)
+        return (opd_name, 0)
+
+@functools.lru_cache(maxsize=32)
+def _miri_mask_image(image_mask, npix, pixelscale, rot1, rot2, shift_x, shift_y):
+    """Cached image of MIRI focal plane mask; see `MIRI_ext.gen_mask_image`
+
+    Do not modify output in place.
+    """
+
+    if image_mask in ['FQPM1065', 'FQPM1140', 'FQPM1550']:
+        # Phase pattern is evaluated at each mask's design wavelength
+        full_pad = _full_pad(_MIRI_MASK_HALF_EXTENT[image_mask], rot2)
+        npix = int(full_pad / pixelscale + 0.5) if npix is None else npix
+        im = _fqpm_image(npix, pixelscale, rot1, rot2, shift_x, shift_y)
+    elif image_mask == 'LYOT2300':
+        full_pad = _full_pad(_MIRI_MASK_HALF_EXTENT['LYOT2300'], rot2)
+        npix = int(full_pad / pixelscale + 0.5) if npix is None else npix
+        wave = _get_mask_wavefront(23e-6, npix, pixelscale)
+        mask = _miri_mask_optic(image_mask, rot1, rot2, shift_x, shift_y)
+        im = mask.get_transmission(wave)
+        np.square(im, out=im)
+    elif image_mask == 'LRS slit':
+        full_pad = _full_pad(_MIRI_MASK_HALF_EXTENT['LRS slit'], rot2)
+        npix = int(full_pad / pixelscale + 0.5) if npix is None else npix
+        # 0/1 transmission, so squaring has no effect
+        im = _lrs_slit_image(npix, pixelscale, rot2, shift_x, shift_y)
+    else:
+        im = np.ones([npix,npix])
+
+    im.setflags(write=False)
+    return im
+
+
 def _init_inst(self, filter=None, pupil_mask=None, image_mask=None, 
                fov_pix=None, oversample=None, **kwargs):
     """
     Setup for specific instrument during init state
     """
 
+    # Reuse FFTW plans measured in previous sessions
+    _load_fftw_wisdom()
+
     # Add grisms as pupil options
     if self.name=='NIRCam':
         self.pupil_mask_list = self.pupil_mask_list + ['GRISMC', 'GRISMR', 'FLAT']
@@ -1914,6 +2157,12 @@ def _init_inst(self, filter=None, pupil_mask=None, image_mask=None,
 
     # Legendre polynomials are more stable
     self.use_legendre = kwargs.get('use_legendre', True)    
+    # Floating point precision of stored PSF coefficients. Setting to
+    # np.float32 halves memory and bandwidth when evaluating PSFs.
+    self.coeff_dtype = kwargs.get('coeff_dtype', np.float64)
+    # Sample monochromatic PSFs at Chebyshev nodes rather than evenly spaced
+    # wavelengths, which better conditions the high-order polynomial fits
+    self.chebyshev_nodes = kwargs.get('chebyshev_nodes', False)
 
     # Turning on quick perform fits over filter bandpasses independently
     # The smaller wavelength range requires fewer monochromaic wavelengths
@@ -1928,16 +2177,7 @@ def _init_inst(self, filter=None, pupil_mask=None, image_mask=None,
     self.ndeg = kwargs.get('ndeg', self._ndeg)
     
     # Set up initial OPD file info
-    opd_name = 'JWST_OTE_OPD_cycle1_example_2022-07-30.fits'
-    try:
-        opd_name = check_fitsgz(opd_name)
-        self._opd_default = opd_name
-    except OSError:
-        opd_name = 'JWST_OTE_OPD_RevAA_prelaunch_predicted.fits'
-        opd_name = check_fitsgz(opd_name)
-        # opd_name = f'OPD_RevW_ote_for_{self.name}_predicted.fits'
-        # opd_name = check_fitsgz(opd_name, self.name)
-        self._opd_default = (opd_name, 0)
+    self._opd_default = _default_opd(stpsf.utils.get_stpsf_data_path())
     self.pupilopd = self._opd_default
 
     # Update telescope pupil and pupil OPD
@@ -1964,7 +2204,7 @@ def _init_inst(self, filter=None, pupil_mask=None, image_mask=None,
     self.psf_coeff = None
     self.psf_coeff_header = None
     self._psf_coeff_mod = {
-        'wfe_drift': None, 'wfe_drift_off': None, 'wfe_drift_lxmap': None,
+        'wfe_drift': None, 'wfe_drift_off': None, 'wfe_drift_lxmap': None, 'wfe_drift_stack': None,
         'si_field': None, 'si_field_v2grid': None, 'si_field_v3grid': None, 'si_field_apname': None,
         'si_mask': None, 'si_mask_xgrid': None, 'si_mask_ygrid': None, 'si_mask_apname': None,
         'si_mask_large': True
@@ -1978,7 +2218,6 @@ def _init_inst(self, filter=None, pupil_mask=None, image_mask=None,
     self.options['jitter_sigma'] = 0.001
 
 
-@plt.style.context('webbpsf_ext.wext_style')
 def _plot_bandpass(self, ax=None, color=None, title=None, 
                    return_ax=False, **kwargs):
     """
@@ -2000,27 +2239,33 @@ def _plot_bandpass(self, ax=None, color=None, title=None,
         Updated axes
     """
 
-    if ax is None:
-        fig, ax = plt.subplots(**kwargs)
-    else:
-        fig = None
+    import matplotlib.pyplot as plt
 
-    bp = self.bandpass
-    w = bp.waveset.to_value('um')
-    f = bp.throughput
-    ax.plot(w, f, color=color, label=bp.name, **kwargs)
-    ax.set_xlabel('Wavelength ($\mathdefault{\mu m}$)')
-    ax.set_ylabel('Throughput')
+    with plt.style.context('webbpsf_ext.wext_style'):
+        if ax is None:
+            fig, ax = plt.subplots(**kwargs)
+        else:
+            fig = None
+
+        bp = self.bandpass
+        w = bp.waveset.to_value('um')
+        f = bp.throughput
+        ax.plot(w, f, color=color, label=bp.name, **kwargs)
+        ax.set_xlabel('Wavelength ($\mathdefault{\mu m}$)')
+        ax.set_ylabel('Throughput')
+
+        if title is None:
+            title = bp.name
+        ax.set_title(title)
 
-    if title is None:
-        title = bp.name
-    ax.set_title(title)
+        if fig is not None:
+            fig.tight_layout()
 
-    if fig is not None:
-        fig.tight_layout()
+        if return_ax:
+            return ax
 
-    if return_ax:
-        return ax
+# Save directories already known to exist
+_save_dirs_checked = set()
 
 def _gen_save_dir(self):
     """
@@ -2046,9 +2291,14 @@ def _gen_save_dir(self):
         self._save_dir = save_dir
 
     # Create directory (and all intermediates) if it doesn't already exist
-    if not os.path.isdir(save_dir):
-        _log.info(f"Creating directory: {save_dir}")
-        os.makedirs(save_dir, exist_ok=True)
+    # Only need to check each directory once per session
+    if save_dir not in _save_dirs_checked:
+        # Still raises FileExistsError if save_dir exists as a file
+        dir_exists = save_dir.is_dir()
+        save_dir.mkdir(parents=True, exist_ok=True)
+        if not dir_exists:
+            _log.info(f"Created directory: {save_dir}")
+        _save_dirs_checked.add(save_dir)
 
     return save_dir
 
@@ -2150,8 +2400,11 @@ def _gen_save_name(self, wfe_drift=0):
     moff_str2 = '' if coron_shift_y==0 else f'_my{coron_shift_y:.3f}'
     moff_str = moff_str1 + moff_str2
     
-    opd_dict = self.get_opd_info()
-    opd_str = opd_dict['opd_str']
+    # Only need OPD description, so skip loading the OPD and building an OTE LM.
+    # Still make sure pupil and OPD sizes match, which may update the OPD.
+    opd = self._opd_default if self.pupilopd is None else self.pupilopd
+    opd_str = _opd_str(opd)
+    _check_opd_size(self, update=True)
 
     if wfe_drift!=0:
         opd_str = '{}-{:.0f}nm'.format(opd_str,wfe_drift)
@@ -2169,11 +2422,50 @@ def _gen_save_name(self, wfe_drift=0):
     if self.use_legendre:
         fname = fname + '_legendre'
 
+    # Monochromatic PSFs sampled at Chebyshev nodes
+    if self.chebyshev_nodes:
+        fname = fname + '_cheb'
+
+    # Add precision tag for non-default coefficient dtypes
+    coeff_dtype = np.dtype(self.coeff_dtype)
+    if coeff_dtype != np.float64:
+        fname = fname + f'_{coeff_dtype.name}'
+
     fname = fname + '.fits'
     
     return fname
 
 
+def _opd_str(opd):
+    """Short OPD description used for logging and coefficient file names"""
+    if isinstance(opd, six.string_types):
+        opd = (opd, 0)
+
+    if isinstance(opd, tuple):
+        if not len(opd)==2:
+            raise ValueError("opd passed as tuple must have length of 2.")
+        opd_name, opd_num = opd
+        rev = [s for s in opd_name.split('_') if "Rev" in s]
+        rev = '' if len(rev)==0 else rev[0]
+        if rev=='':
+            opd_str = 'OPD-' + opd_name.split('.')[0].split('_')[-1]
+        else:
+            opd_str = '{}slice{:.0f}'.format(rev,opd_num)
+    elif isinstance(opd, fits.HDUList):
+        opd_str = f'OPDcustomHDUL{opd[0].data.shape[-1]}'
+        obsdate = opd[0].header.get('DATE-OBS', None)
+        if obsdate is not None:
+            opd_str = f'{opd_str}-{obsdate}'
+    elif isinstance(opd, poppy.OpticalElement):
+        opd_str = f'OPDcustomLM{opd.npix}'
+        obsdate = opd.header.get('DATE-OBS', None)
+        if obsdate is not None:
+            opd_str = f'{opd_str}-{obsdate}'
+    else:
+        raise ValueError("OPD must be a string, tuple, HDUList, or OTE LM.")
+
+    return opd_str
+
 def _get_opd_info(self, opd=None, pupil=None, HDUL_to_OTELM=True):
     """
     Parse out OPD information for a given OPD, which can be a 
@@ -2207,38 +2499,21 @@ def _get_opd_info(self, opd=None, pupil=None, HDUL_to_OTELM=True):
     setup_logging('WARN', verbose=False)
 
     # Parse OPD info
+    opd_str = _opd_str(opd)
     if isinstance(opd, tuple):
-        if not len(opd)==2:
-            raise ValueError("opd passed as tuple must have length of 2.")
         # Filename info
         opd_name = opd[0] # OPD file name
         opd_num  = opd[1] # OPD slice
-        rev = [s for s in opd_name.split('_') if "Rev" in s]
-        rev = '' if len(rev)==0 else rev[0]
-        if rev=='':
-            opd_str = 'OPD-' + opd_name.split('.')[0].split('_')[-1]
-        else:
-            opd_str = '{}slice{:.0f}'.format(rev,opd_num)
         opd = OPDFile_to_HDUList(opd_name, opd_num)
     elif isinstance(opd, fits.HDUList):
         # A custom OPD is passed. 
         opd_name = 'OPD from FITS HDUList'
         opd_num = 0
-        opd_str = f'OPDcustomHDUL{opd[0].data.shape[-1]}'
-        obsdate = opd[0].header.get('DATE-OBS', None)
-        if obsdate is not None:
-            opd_str = f'{opd_str}-{obsdate}'
-    elif isinstance(opd, poppy.OpticalElement):
+    else:
         # OTE Linear Model
         # opd_name = 'OPD from OTE LM'
         opd_name = opd.name
         opd_num = 0
-        opd_str = f'OPDcustomLM{opd.npix}'
-        obsdate = opd.header.get('DATE-OBS', None)
-        if obsdate is not None:
-            opd_str = f'{opd_str}-{obsdate}'
-    else:
-        raise ValueError("OPD must be a string, tuple, HDUList, or OTE LM.")
         
     # Check pupil sizes match OPD
     _check_opd_size(self, update=True)
@@ -2299,9 +2574,8 @@ def _check_opd_size(self, update=True):
             raise ValueError("opd passed as tuple must have length of 2.")
         # Filename info
         opd_name = opd[0] # OPD file name
-        opd_num  = opd[1] # OPD slice
-        opd = OPDFile_to_HDUList(opd_name, opd_num)
-        npix_opd = opd[0].data.shape[-1]
+        # Only need image size, so avoid reading the full OPD file
+        npix_opd = OPDFile_npix(opd_name)
     elif isinstance(opd, fits.HDUList):
         npix_opd = opd[0].data.shape[-1]
     elif isinstance(opd, poppy.OpticalElement):
@@ -2314,6 +2588,8 @@ def _check_opd_size(self, update=True):
     else:
         if update:
             _log.warning('Pupil and OPD sizes do not match. Resizing OPD to match pupil.')
+            if isinstance(opd, tuple):
+                opd = OPDFile_to_HDUList(*opd)
             header = opd[0].header if isinstance(opd, fits.HDUList) else opd.header
             date_obs = header.get('DATE-OBS', '2022-07-30')
             time_obs = header.get('TIME-OBS', '00:00:00')[0:8]
@@ -2868,6 +3144,8 @@ def _inst_copy(self):
 
     # PSF coeff info
     inst.use_legendre = self.use_legendre
+    inst.coeff_dtype = self.coeff_dtype
+    inst.chebyshev_nodes = self.chebyshev_nodes
     inst._ndeg = self._ndeg
     inst._npsf = self._npsf
     inst._quick = self._quick
@@ -2891,6 +3169,101 @@ def _inst_copy(self):
     return inst
 
 
+# Persistent pool of worker processes for monochromatic PSF calculations.
+# Workers inherit the parent's global state (POPPY settings, data paths) 
+# when the pool is created, so the pool is recreated whenever those change.
+# Workers otherwise hold their memory until `shutdown_psf_pool` is called.
+_psf_pool = None
+_psf_pool_key = None
+
+def _psf_pool_init():
+    """Worker process initializer for monochromatic PSF calculations"""
+    # Quiet logging and disable nested multiprocessing within workers
+    setup_logging('WARN', verbose=False)
+    poppy.conf.use_multiprocessing = False
+    _load_fftw_wisdom(save_at_exit=False)
+
+def _psf_pool_state():
+    """Parent process settings that worker processes depend on"""
+    poppy_keys = ['use_fftw', 'use_mkl', 'use_cuda', 'use_opencl', 'double_precision']
+    poppy_vals = tuple(getattr(poppy.conf, k, None) for k in poppy_keys)
+    paths = (conf.WEBBPSF_EXT_PATH, os.getenv('WEBBPSF_EXT_PATH'), os.getenv('STPSF_PATH'))
+    return poppy_vals + paths
+
+def _get_psf_pool(nproc):
+    """Return pool of `nproc` worker processes, creating it if necessary"""
+    global _psf_pool, _psf_pool_key
+
+    key = (nproc,) + _psf_pool_state()
+    if (_psf_pool is None) or (_psf_pool_key != key):
+        shutdown_psf_pool()
+        _psf_pool = ProcessPoolExecutor(max_workers=nproc, initializer=_psf_pool_init)
+        _psf_pool_key = key
+    return _psf_pool
+
+def shutdown_psf_pool():
+    """Shut down worker processes used for PSF coefficient calculations
+
+    Worker processes are kept alive between calculations to avoid 
+    start-up overheads. Call this to release their memory. A new pool
+    is created automatically the next time one is needed.
+    """
+    global _psf_pool, _psf_pool_key
+
+    if _psf_pool is not None:
+        _psf_pool.shutdown(wait=True, cancel_futures=True)
+    _psf_pool = None
+    _psf_pool_key = None
+
+atexit.register(shutdown_psf_pool)
+
+# FFTW wisdom (optimized FFT plans) persisted across sessions
+_fftw_wisdom_loaded = False
+
+def _fftw_wisdom_file():
+    """File to store FFTW wisdom, or None if no valid data directory"""
+    wext_data_dir = conf.WEBBPSF_EXT_PATH
+    if (wext_data_dir is None) or (wext_data_dir == '/'):
+        wext_data_dir = os.getenv('WEBBPSF_EXT_PATH')
+    if (wext_data_dir is None) or (wext_data_dir == ''):
+        return None
+    return Path(wext_data_dir) / 'fftw_wisdom.pkl'
+
+def _load_fftw_wisdom(save_at_exit=True):
+    """Import saved FFTW wisdom once per session if poppy is using FFTW"""
+    global _fftw_wisdom_loaded
+
+    if _fftw_wisdom_loaded:
+        return
+    _fftw_wisdom_loaded = True
+
+    if not poppy.accel_math._FFTW_AVAILABLE:
+        return
+
+    import pickle
+    fname = _fftw_wisdom_file()
+    if (fname is not None) and fname.exists():
+        try:
+            with open(fname, 'rb') as f:
+                poppy.accel_math.pyfftw.import_wisdom(pickle.load(f))
+        except Exception as e:
+            _log.warning(f"Could not load FFTW wisdom from {fname}: {e}")
+
+    if save_at_exit:
+        atexit.register(_save_fftw_wisdom)
+
+def _save_fftw_wisdom():
+    """Export FFTW wisdom accumulated during this session"""
+    import pickle
+    fname = _fftw_wisdom_file()
+    if (fname is None) or (not fname.parent.is_dir()):
+        return
+    try:
+        with open(fname, 'wb') as f:
+            pickle.dump(poppy.accel_math.pyfftw.export_wisdom(), f)
+    except Exception as e:
+        _log.warning(f"Could not save FFTW wisdom to {fname}: {e}")
+
 def _wrap_coeff_for_mp(args):
     """
     Internal helper routine for parallelizing computations across multiple processors
@@ -2935,8 +3308,91 @@ def _wrap_coeff_for_mp(args):
     hdu.header['OSAMP'] = (inst.oversample, 'Image oversample vs det')
     return hdu
 
+def _adaptive_wave_grid(calc_psfs, w1, w2, ndeg, npsf, tolerance_rms, use_legendre=True):
+    """Adaptively sampled wavelengths for fitting PSF coefficients
+
+    Starts with `ndeg+2` evenly spaced PSFs across [w1,w2] and bisects intervals
+    where the polynomial fit fails to reproduce a freshly computed PSF at the 
+    midpoint to within `tolerance_rms`. Every computed PSF is kept in the grid.
+    Once the number of candidate intervals exceeds the remaining budget of `npsf`,
+    those with the largest residual at their parent's midpoint are refined first 
+    (ties are spread evenly across the bandpass).
+
+    Parameters
+    ----------
+    calc_psfs : func
+        Function that takes an array of wavelengths (um) and returns a list of
+        HDUs (or any objects with a `data` attribute) containing PSF images.
+    w1, w2 : float
+        Wavelength range (um). Also used for the Legendre x-value mapping.
+    ndeg : int
+        Polynomial degree of the fit.
+    npsf : int
+        Maximum number of PSFs to compute.
+    tolerance_rms : float
+        Maximum RMS residual between fit and PSF at interval midpoints.
+
+    Returns
+    -------
+    waves : ndarray
+        Sorted wavelengths of computed PSFs.
+    hdu_arr : list
+        Corresponding outputs from `calc_psfs`.
+    """
+    lxmap = [w1, w2]
+    waves = np.linspace(w1, w2, ndeg+2)
+    hdu_arr = list(calc_psfs(waves))
+    # Estimated residual for each interval; unknown until its midpoint is sampled
+    err = np.full(len(waves)-1, np.inf)
+
+    while len(waves) < npsf:
+        ibad = np.where(err > tolerance_rms)[0]
+        if len(ibad)==0:
+            break
+
+        # Not enough PSFs remaining to bisect every interval
+        nleft = npsf - len(waves)
+        if len(ibad) > nleft:
+            widths = np.diff(waves)[ibad]
+            # Largest error first, then widest; stable sort keeps wavelength order for ties
+            order = np.lexsort((-widths, -err[ibad]))
+            isel = order[:nleft]
+            # Intervals tied with the last selected one are chosen evenly across the band
+            ilast = order[nleft-1]
+            tied = order[(err[ibad][order] == err[ibad][ilast]) & np.isclose(widths[order], widths[ilast])]
+            if len(tied) > 1:
+                nbetter = np.sum(~np.isin(isel, tied))
+                ispread = np.round(np.linspace(0, len(tied)-1, nleft-nbetter)).astype(int)
+                isel = np.concatenate([isel[~np.isin(isel, tied)], np.sort(tied)[ispread]])
+            ibad = np.sort(ibad[isel])
+
+        images = np.asarray([hdu.data for hdu in hdu_arr])
+        cf = jl_poly_fit(waves, images, deg=ndeg, use_legendre=use_legendre, lxmap=lxmap)
+
+        wmid = 0.5 * (waves[ibad] + waves[ibad+1])
+        hdu_mid = list(calc_psfs(wmid))
+        im_mid = np.asarray([hdu.data for hdu in hdu_mid])
+        im_fit = jl_poly(wmid, cf, use_legendre=use_legendre, lxmap=lxmap).reshape(im_mid.shape)
+        resid_rms = np.sqrt(np.mean((im_mid - im_fit)**2, axis=tuple(range(1,im_mid.ndim))))
+        _log.debug(f'Adaptive PSF grid: max residual RMS {resid_rms.max():.2e}')
+
+        # Both halves of a bisected interval inherit the midpoint residual
+        err_new = list(err)
+        for i, r in sorted(zip(ibad, resid_rms), reverse=True):
+            err_new[i:i+1] = [r, r]
+        err = np.asarray(err_new)
+
+        # Keep every computed PSF, sorted by wavelength
+        waves = np.concatenate([waves, wmid])
+        hdu_arr = hdu_arr + hdu_mid
+        isort = np.argsort(waves)
+        waves = waves[isort]
+        hdu_arr = [hdu_arr[i] for i in isort]
+
+    return waves, hdu_arr
+
 def _gen_psf_coeff(self, nproc=None, wfe_drift=0, force=False, save=True, 
-                   return_results=False, return_extras=False, **kwargs):
+                   return_results=False, return_extras=False, tolerance_rms=None, **kwargs):
 
     """Generate PSF coefficients
 
@@ -2977,21 +3433,49 @@ def _gen_psf_coeff(self, nproc=None, wfe_drift=0, force=False, save=True,
         `return_results`. If `return_results=False`, then only this dictionary is
         returned, otherwise if `return_results=False` then returns everything as a
         3-element tuple (psf_coeff, psf_coeff_header, extras_dict).
+    tolerance_rms : float or None
+        If set, build the wavelength grid adaptively. Starts with `ndeg+2`
+        evenly spaced PSFs and bisects intervals where the RMS residual
+        between the polynomial fit and a monochromatic PSF at the midpoint
+        exceeds this value (in normalized PSF units). All computed PSFs are
+        used in the fit. Total number of PSFs is capped at `npsf`. Default of 
+        None uses `npsf` evenly spaced PSFs. A saved coefficient file is only
+        loaded if it was generated with the same `tolerance_rms`.
     """
 
     save_name = self.save_name
     outfile = str(self.save_dir / save_name)
 
+    # Adaptive and fixed wavelength grids share a file name, so check 
+    # that the saved sampling matches the requested one before loading
+    load_file = os.path.exists(outfile) and (not force)
+    if load_file:
+        tol_file = fits.getheader(outfile).get('TOLRMS', 'None')
+        tol_file = None if tol_file == 'None' else float(tol_file)
+        if tol_file != tolerance_rms:
+            _log.info(f'Saved tolerance_rms={tol_file} does not match requested {tolerance_rms}')
+            load_file = False
+
     # Load data from already saved FITS file
-    if os.path.exists(outfile) and (not force):
+    if load_file:
         if return_extras:
             _log.warning("return_extras only valid if coefficient files does not exist or force=True")
 
         _log.info(f'Loading {outfile}')
-        hdul = fits.open(outfile)
-        data = hdul[0].data.astype(float)
-        hdr  = hdul[0].header
-        hdul.close()
+        crop = (not return_results) and self.use_fov_pix_plus1
+        with fits.open(outfile, memmap=True) as hdul:
+            data = hdul[0].data
+            hdr  = hdul[0].header
+
+            # Crop by oversampling amount if use_fov_pix_plus1
+            if crop:
+                osamp_half = self.oversample // 2
+                data = data[:, osamp_half:-osamp_half, osamp_half:-osamp_half]
+                hdr['FOVPIX'] = (self.fov_pix, 'STPSF pixel FoV')
+
+            # Single copy out of the memory-mapped (big-endian) file into a 
+            # native, contiguous array; only the cropped region is read
+            data = np.ascontiguousarray(data, dtype=self.coeff_dtype)
 
         # Output if return_results=True, otherwise save to attributes
         if return_results:
@@ -3002,12 +3486,6 @@ def _gen_psf_coeff(self, nproc=None, wfe_drift=0, force=False, save=True,
             except AttributeError:
                 pass
 
-            # Crop by oversampling amount if use_fov_pix_plus1
-            if self.use_fov_pix_plus1:
-                osamp_half = self.oversample // 2
-                data = data[:, osamp_half:-osamp_half, osamp_half:-osamp_half]
-                hdr['FOVPIX'] = (self.fov_pix, 'STPSF pixel FoV')
-
             self.psf_coeff = data
             self.psf_coeff_header = hdr
             return
@@ -3023,7 +3501,12 @@ def _gen_psf_coeff(self, nproc=None, wfe_drift=0, force=False, save=True,
     # w2 = self.bandpass.wave.max() / 1e4
     w1, w2 = self.wave_fit
     npsf = self.npsf
-    waves = np.linspace(w1, w2, npsf)
+    if self.chebyshev_nodes:
+        # Chebyshev nodes of the first kind mapped to [w1,w2], ascending
+        k = np.arange(npsf, 0, -1)
+        waves = 0.5*(w1+w2) + 0.5*(w2-w1) * np.cos((2*k-1) * np.pi / (2*npsf))
+    else:
+        waves = np.linspace(w1, w2, npsf)
         
     fov_pix = self.fov_pix + 1 if self.use_fov_pix_plus1 else self.fov_pix
     oversample = self.oversample 
@@ -3060,46 +3543,60 @@ def _gen_psf_coeff(self, nproc=None, wfe_drift=0, force=False, save=True,
     inst_copy.fov_pix = fov_pix
 
     t0 = time.time()
-    # Setup the multiprocessing pool and arguments to pass to each pool
-    worker_arguments = [(inst_copy, wlen) for wlen in waves]
-    if nproc > 1:
 
-        hdu_arr = []
-        try:
-            with mp.Pool(nproc) as pool:
-                for res in tqdm(pool.imap(_wrap_coeff_for_mp, worker_arguments), 
-                                total=npsf, desc='Monochromatic PSFs', leave=False):
-                    hdu_arr.append(res)
-                pool.close()
-            if hdu_arr[0] is None:
-                raise RuntimeError('Returned None values. Issue with multiprocess or STPSF??')
-        except Exception as e:
-            setup_logging(log_prev, verbose=False)
-            _log.error('Caught an exception during multiprocess.')
-            _log.info('Closing multiprocess pool.')
-            raise e
+    def _calc_mono_psfs(wvals):
+        """Monochromatic PSFs at each wavelength in `wvals`"""
+        nwave = len(wvals)
+        # Setup the multiprocessing pool and arguments to pass to each pool
+        worker_arguments = [(inst_copy, wlen) for wlen in wvals]
+        if nproc > 1:
+
+            hdus = []
+            try:
+                # Reuse worker processes across calls
+                pool = _get_psf_pool(nproc)
+                chunksize = max(1, nwave // (4*nproc))
+                for res in tqdm(pool.map(_wrap_coeff_for_mp, worker_arguments, chunksize=chunksize), 
+                                total=nwave, desc='Monochromatic PSFs', leave=False):
+                    hdus.append(res)
+                if hdus[0] is None:
+                    raise RuntimeError('Returned None values. Issue with multiprocess or STPSF??')
+            except Exception as e:
+                setup_logging(log_prev, verbose=False)
+                _log.error('Caught an exception during multiprocess.')
+                _log.info('Closing multiprocess pool.')
+                shutdown_psf_pool()
+                raise e
         else:
-            _log.info('Closing multiprocess pool.')
+            # Pass arguments to the helper function
+            hdus = []
+            for wa in tqdm(worker_arguments, desc='Monochromatic PSFs', leave=False):
+                hdu = _wrap_coeff_for_mp(wa)
+                if hdu is None:
+                    raise RuntimeError('Returned None values. Issue with STPSF??')
+                hdus.append(hdu)
+
+        # Ensure PSF sum is not larger than 1.0
+        # This can sometimes occur for distorted PSFs near edges
+        for hdu in hdus:
+            data_sum = hdu.data.sum()
+            if data_sum>1:
+                hdu.data /= data_sum
+
+        return hdus
+
+    use_legendre = self.use_legendre
+    ndeg = self.ndeg
+    if tolerance_rms is None:
+        hdu_arr = _calc_mono_psfs(waves)
     else:
-        # Pass arguments to the helper function
-        hdu_arr = []
-        for wa in tqdm(worker_arguments, desc='Monochromatic PSFs', leave=False):
-            hdu = _wrap_coeff_for_mp(wa)
-            if hdu is None:
-                raise RuntimeError('Returned None values. Issue with STPSF??')
-            hdu_arr.append(hdu)
-
-    del inst_copy, worker_arguments
+        waves, hdu_arr = _adaptive_wave_grid(_calc_mono_psfs, w1, w2, ndeg, npsf, tolerance_rms,
+                                             use_legendre=use_legendre)
+        npsf = len(waves)
+
+    del inst_copy
     t1 = time.time()
 
-    # Ensure PSF sum is not larger than 1.0
-    # This can sometimes occur for distorted PSFs near edges
-    for hdu in hdu_arr:
-        data_sum = hdu.data.sum()
-        # print(data_sum)
-        if data_sum>1:
-            hdu.data /= data_sum
-    
     # Reset pupils
     self.pupilopd = pupilopd_orig
     self.pupil = pupil_orig
@@ -3118,9 +3615,8 @@ def _gen_psf_coeff(self, nproc=None, wfe_drift=0, force=False, save=True,
     images = np.asarray(images)
 
     # Simultaneous polynomial fits to all pixels using linear least squares
-    use_legendre = self.use_legendre
-    ndeg = self.ndeg
     coeff_all = jl_poly_fit(waves, images, deg=ndeg, use_legendre=use_legendre, lxmap=[w1,w2])
+    coeff_all = coeff_all.astype(self.coeff_dtype, copy=False)
 
     ################################
     # Create HDU and header
@@ -3175,6 +3671,8 @@ def _gen_psf_coeff(self, nproc=None, wfe_drift=0, force=False, save=True,
     hdr['WAVE1']  = (w1, 'First wavelength in calc')
     hdr['WAVE2']  = (w2, 'Last of wavelength in calc')
     hdr['LEGNDR'] = (use_legendre, 'Legendre polynomial fit?')
+    hdr['CHEBNODE'] = (self.chebyshev_nodes and (tolerance_rms is None), 'PSFs at Chebyshev nodes?')
+    hdr['TOLRMS'] = ('None' if tolerance_rms is None else tolerance_rms, 'Adaptive wavelength grid RMS tolerance')
     hdr['OFFR']  = (offset_r, 'Radial offset')
     hdr['OFFTH'] = (offset_theta, 'Position angle for OFFR (CCW)')
     if (self.image_mask is not None) and ('WB' in self.image_mask):
@@ -3237,7 +3735,8 @@ def _gen_psf_coeff(self, nproc=None, wfe_drift=0, force=False, save=True,
             coeff_all = coeff_all[:, osamp_half:-osamp_half, osamp_half:-osamp_half]
             hdr['FOVPIX'] = (self.fov_pix, 'STPSF pixel FoV')
             
-        self.psf_coeff = coeff_all
+        # Store as contiguous array so evaluations don't copy the cropped view
+        self.psf_coeff = np.ascontiguousarray(coeff_all)
         self.psf_coeff_header = hdr
 
     # Create an extras dictionary for debugging purposes
@@ -3327,15 +3826,15 @@ def _gen_wfedrift_coeff(self, force=False, save=True, wfe_list=[0,1,2,5,10,20,40
         # Return fov_pix to original size
         self.fov_pix = fov_pix_orig
         _log.info(f"Loading {outname}")
-        out = np.load(outname)
-
-        wfe_drift = out.get('wfe_drift')
-        # Account for possibility that wfe_drift_off is None
-        try:
-            wfe_drift_off = out.get('wfe_drift_off')
-        except ValueError:
-            wfe_drift_off = None
-        wfe_drift_lxmap = out.get('wfe_drift_lxmap')
+        # Read each member once and release the file handle
+        with np.load(outname) as out:
+            wfe_drift = out.get('wfe_drift')
+            # Account for possibility that wfe_drift_off is None
+            try:
+                wfe_drift_off = out.get('wfe_drift_off')
+            except ValueError:
+                wfe_drift_off = None
+            wfe_drift_lxmap = out.get('wfe_drift_lxmap')
 
         if return_results:
             return wfe_drift, wfe_drift_off, wfe_drift_lxmap
@@ -3351,9 +3850,7 @@ def _gen_wfedrift_coeff(self, force=False, save=True, wfe_list=[0,1,2,5,10,20,40
                                                   osamp_half:-osamp_half, 
                                                   osamp_half:-osamp_half]
 
-            self._psf_coeff_mod['wfe_drift'] = wfe_drift
-            self._psf_coeff_mod['wfe_drift_off'] = wfe_drift_off
-            self._psf_coeff_mod['wfe_drift_lxmap'] = wfe_drift_lxmap
+            _store_wfedrift_coeff(self, wfe_drift, wfe_drift_off, wfe_drift_lxmap)
             return
 
     _log.warning('Generating WFE Drift coefficients. This may take some time...')
@@ -3408,8 +3905,9 @@ def _gen_wfedrift_coeff(self, force=False, save=True, wfe_list=[0,1,2,5,10,20,40
         if return_raw:
             return cf_wfe, cf_wfe_off, wfe_list
 
-        # Get residuals of off-axis PSF
-        cf_wfe_off = cf_wfe_off - cf_wfe_off[0]
+        # Get residuals of off-axis PSF (in place to avoid copying large cube)
+        cf_wfe_off[1:] -= cf_wfe_off[0]
+        cf_wfe_off[0] = 0
 
         # Fit each pixel with a polynomial and save the coefficient
         cf_shape = cf_wfe_off.shape[1:]
@@ -3428,8 +3926,9 @@ def _gen_wfedrift_coeff(self, force=False, save=True, wfe_list=[0,1,2,5,10,20,40
         if return_raw:
             return cf_wfe, cf_wfe_off, wfe_list
 
-    # Get residuals
-    cf_wfe = cf_wfe - cf_wfe[0]
+    # Get residuals (in place to avoid copying large cube)
+    cf_wfe[1:] -= cf_wfe[0]
+    cf_wfe[0] = 0
 
     # Fit each pixel with a polynomial and save the coefficient
     cf_shape = cf_wfe.shape[1:]
@@ -3456,9 +3955,27 @@ def _gen_wfedrift_coeff(self, force=False, save=True, wfe_list=[0,1,2,5,10,20,40
             if cf_fit_off is not None:
                 cf_fit_off = cf_fit_off[:, :, osamp_half:-osamp_half, osamp_half:-osamp_half]
                     
-        self._psf_coeff_mod['wfe_drift'] = cf_fit
-        self._psf_coeff_mod['wfe_drift_off'] = cf_fit_off
-        self._psf_coeff_mod['wfe_drift_lxmap'] = lxmap
+        _store_wfedrift_coeff(self, cf_fit, cf_fit_off, lxmap)
+
+def _store_wfedrift_coeff(self, cf_fit, cf_fit_off, lxmap):
+    """ Store WFE drift coefficients in `self._psf_coeff_mod`
+
+    On- and off-axis coefficients are packed into a single contiguous
+    array of shape (ndeg+1, 2, ncf, ny, nx) so that both sets can be 
+    evaluated with one polynomial call. The 'wfe_drift' and 'wfe_drift_off'
+    entries are views into that array.
+    """
+    if cf_fit_off is None:
+        cf_stack = np.ascontiguousarray(cf_fit[:, None], dtype=self.coeff_dtype)
+        cf_fit = cf_stack[:, 0]
+    else:
+        cf_stack = np.ascontiguousarray(np.stack([cf_fit, cf_fit_off], axis=1), dtype=self.coeff_dtype)
+        cf_fit, cf_fit_off = cf_stack[:, 0], cf_stack[:, 1]
+
+    self._psf_coeff_mod['wfe_drift'] = cf_fit
+    self._psf_coeff_mod['wfe_drift_off'] = cf_fit_off
+    self._psf_coeff_mod['wfe_drift_lxmap'] = lxmap
+    self._psf_coeff_mod['wfe_drift_stack'] = cf_stack
 
 
 def _gen_wfefield_coeff(self, force=False, save=True, return_results=False, return_raw=False, **kwargs):
@@ -3525,20 +4042,21 @@ def _gen_wfefield_coeff(self, force=False, save=True, return_results=False, retu
         # Return fov_pix to original size
         self.fov_pix = fov_pix_orig
         _log.info(f"Loading {outname}")
-        out = np.load(outname)
+        # Read each member once and release the file handle
+        with np.load(outname) as out:
+            si_field, v2grid, v3grid, apname = [out[f'arr_{i}'] for i in range(4)]
         if return_results:
-            return out['arr_0'], out['arr_1'], out['arr_2'], out['arr_3']
+            return si_field, v2grid, v3grid, apname
         else:
-            si_field = out['arr_0']
             # Crop by oversampling amount if use_fov_pix_plus1
             if use_fov_pix_plus1:
                 osamp_half = self.oversample // 2
                 si_field = si_field[:, :, :, osamp_half:-osamp_half, osamp_half:-osamp_half]
 
-            self._psf_coeff_mod['si_field'] = si_field
-            self._psf_coeff_mod['si_field_v2grid'] = out['arr_1']
-            self._psf_coeff_mod['si_field_v3grid'] = out['arr_2']
-            self._psf_coeff_mod['si_field_apname'] = out['arr_3'].flatten()[0]
+            self._psf_coeff_mod['si_field'] = np.ascontiguousarray(si_field, dtype=self.coeff_dtype)
+            self._psf_coeff_mod['si_field_v2grid'] = np.ascontiguousarray(v2grid, dtype=float)
+            self._psf_coeff_mod['si_field_v3grid'] = np.ascontiguousarray(v3grid, dtype=float)
+            self._psf_coeff_mod['si_field_apname'] = str(apname.flatten()[0])
             return
 
     _log.warning('Generating field-dependent coefficients. This may take some time...')
@@ -3681,12 +4199,48 @@ def _gen_wfefield_coeff(self, force=False, save=True, return_results=False, retu
             osamp_half = self.oversample // 2
             res = res[:, :, :, osamp_half:-osamp_half, osamp_half:-osamp_half]
 
-        self._psf_coeff_mod['si_field'] = res
-        self._psf_coeff_mod['si_field_v2grid'] = v2grid
-        self._psf_coeff_mod['si_field_v3grid'] = v3grid
+        self._psf_coeff_mod['si_field'] = np.ascontiguousarray(res, dtype=self.coeff_dtype)
+        self._psf_coeff_mod['si_field_v2grid'] = np.ascontiguousarray(v2grid, dtype=float)
+        self._psf_coeff_mod['si_field_v3grid'] = np.ascontiguousarray(v3grid, dtype=float)
         self._psf_coeff_mod['si_field_apname'] = apname
 
 
+def _wfemask_cache_key(self, large_grid, **kwargs):
+    """ Hash of all settings that affect the mask-dependent PSF coefficients
+
+    Used to name the directory of per-position checkpoints so that an
+    interrupted `gen_wfemask_coeff` run can be resumed.
+    """
+    import hashlib
+
+    bar_offset = self.options.get('bar_offset', None)
+    config = (self.name, self.save_name, self.filter, self.image_mask, self.pupil_mask,
+              self.oversample, self.fov_pix, self.npsf, self.ndeg, bar_offset,
+              tuple(np.round(self.detector_position, 3)), bool(large_grid),
+              sorted((k, repr(v)) for k, v in kwargs.items()))
+    return hashlib.sha256(repr(config).encode()).hexdigest()[:16]
+
+def _wfemask_psf_coeff(self, xv, yv, ckpt_dir=None, **kwargs):
+    """ PSF coefficients at a given mask offset, checkpointed to `ckpt_dir`"""
+    if ckpt_dir is not None:
+        fname = ckpt_dir / f'coeff_x{xv:+.4f}_y{yv:+.4f}.npy'
+        if fname.exists():
+            try:
+                return np.load(fname)
+            except (OSError, ValueError, EOFError):
+                _log.warning(f'Unreadable checkpoint {fname.name}. Recomputing...')
+
+    cf, _ = self.gen_psf_coeff(return_results=True, force=True, save=False, **kwargs)
+
+    if ckpt_dir is not None:
+        # Write to a temporary file and rename so that an interrupted
+        # write never leaves a truncated checkpoint behind
+        fname_tmp = fname.with_name(fname.name + '.tmp')
+        with open(fname_tmp, 'wb') as f:
+            np.save(f, cf)
+        os.replace(fname_tmp, fname)
+    return cf
+
 def _gen_wfemask_coeff(self, force=False, save=True, large_grid=None,
                        return_results=False, return_raw=False, **kwargs):
 
@@ -3727,20 +4281,21 @@ def _gen_wfemask_coeff(self, force=False, save=True, large_grid=None,
         self.fov_pix = fov_pix_orig
 
         _log.info(f"Loading {outname}")
-        out = np.load(outname)
+        # Read each member once and release the file handle
+        with np.load(outname) as out:
+            si_mask, xgrid, ygrid, apname = [out[f'arr_{i}'] for i in range(4)]
         if return_results:
-            return out['arr_0'], out['arr_1'], out['arr_2'], out['arr_3']
+            return si_mask, xgrid, ygrid, apname
         else:
-            si_mask = out['arr_0']
             # Crop by oversampling amount if use_fov_pix_plus1
             if use_fov_pix_plus1:
                 osamp_half = self.oversample // 2
                 si_mask = si_mask[:, :, :, osamp_half:-osamp_half, osamp_half:-osamp_half]
 
-            self._psf_coeff_mod['si_mask'] = si_mask
-            self._psf_coeff_mod['si_mask_xgrid'] = out['arr_1']
-            self._psf_coeff_mod['si_mask_ygrid'] = out['arr_2']
-            self._psf_coeff_mod['si_mask_apname'] = out['arr_3'].flatten()[0]
+            self._psf_coeff_mod['si_mask'] = np.ascontiguousarray(si_mask, dtype=self.coeff_dtype)
+            self._psf_coeff_mod['si_mask_xgrid'] = np.ascontiguousarray(xgrid, dtype=float)
+            self._psf_coeff_mod['si_mask_ygrid'] = np.ascontiguousarray(ygrid, dtype=float)
+            self._psf_coeff_mod['si_mask_apname'] = str(apname.flatten()[0])
             self._psf_coeff_mod['si_mask_large'] = large_grid
             return
 
@@ -3749,6 +4304,15 @@ def _gen_wfemask_coeff(self, force=False, save=True, large_grid=None,
     else:
         _log.warning('Generating mask position-dependent coeffs (small grid). This may take some time...')
 
+    # Per-position coefficients are checkpointed to disk while saving
+    # so that an interrupted run can pick up where it left off
+    if save:
+        ckpt_dir = save_dir / f'wfemask_{_wfemask_cache_key(self, large_grid, **kwargs)}'
+        ckpt_dir.mkdir(parents=True, exist_ok=True)
+        _log.info(f"Checkpointing mask offset coefficients to {ckpt_dir}")
+    else:
+        ckpt_dir = None
+
     # Current mask positions to return to at end
     # Bar offset is set to 0 during psf_coeff calculation
     coron_shift_x_orig = self.options.get('coron_shift_x', 0)
@@ -3883,7 +4447,7 @@ def _gen_wfemask_coeff(self, force=False, save=True, large_grid=None,
 
             # Skip SGD locations until later
             if ind_sgd[i]==False:
-                cf, _ = self.gen_psf_coeff(return_results=True, force=True, save=False, **kwargs)
+                cf = _wfemask_psf_coeff(self, xv, yv, ckpt_dir=ckpt_dir, **kwargs)
                 cf_all[i] = cf
                 # Save central coefficient to it's own variable
                 if (xv==0) and (yv==0):
@@ -4134,7 +4698,7 @@ def _gen_wfemask_coeff(self, force=False, save=True, large_grid=None,
                 xyoff_pix = np.array(xy_rot(-1*xv, -1*yv, -field_rot)) / self.pixelscale
                 self.detector_position = np.array(detector_position_orig) + xyoff_pix
 
-                cf, _ = self.gen_psf_coeff(return_results=True, force=True, save=False, **kwargs)
+                cf = _wfemask_psf_coeff(self, xv, yv, ckpt_dir=ckpt_dir, **kwargs)
                 ind = (xoff_all==xv) & (yoff_all==yv)
                 cf_resid_all[ind] = cf - coeff0
     except:
@@ -4161,6 +4725,9 @@ def _gen_wfemask_coeff(self, force=False, save=True, large_grid=None,
     if save: 
         _log.info(f"Saving to {outname}")
         np.savez(outname, cf_resid_all, xvals, yvals, apname)
+        # Checkpoints are no longer needed once the full grid is saved
+        import shutil
+        shutil.rmtree(ckpt_dir, ignore_errors=True)
 
     if return_results:
         return cf_resid_all, xvals, yvals
@@ -4170,10 +4737,9 @@ def _gen_wfemask_coeff(self, force=False, save=True, large_grid=None,
             osamp_half = self.oversample // 2
             cf_resid_all = cf_resid_all[:, :, :, osamp_half:-osamp_half, osamp_half:-osamp_half]
 
-
-        self._psf_coeff_mod['si_mask'] = cf_resid_all
-        self._psf_coeff_mod['si_mask_xgrid'] = xvals
-        self._psf_coeff_mod['si_mask_ygrid'] = yvals
+        self._psf_coeff_mod['si_mask'] = np.ascontiguousarray(cf_resid_all, dtype=self.coeff_dtype)
+        self._psf_coeff_mod['si_mask_xgrid'] = np.ascontiguousarray(xvals, dtype=float)
+        self._psf_coeff_mod['si_mask_ygrid'] = np.ascontiguousarray(yvals, dtype=float)
         self._psf_coeff_mod['si_mask_apname'] = apname
         self._psf_coeff_mod['si_mask_large'] = large_grid
 
@@ -4336,7 +4902,12 @@ def _calc_psf_from_coeff(self, sp=None, return_oversample=True, return_hdul=True
     psf_coeff = psf_coeff_mod
 
     # if multiple field points were present, we want to return PSF for each location
-    if nfield>1:
+    if (nfield>1) and (not is_spec) and (nspec<=1):
+        # Same spectrum at each field point, so evaluate all PSFs in a single pass
+        wave = None
+        psf_all = gen_image_from_coeff(self, psf_coeff, psf_coeff_hdr, sp_norm=sp,
+                                       return_oversample=return_oversample)
+    elif nfield>1:
         psf_all = []
         for ii in trange(nfield, leave=True, desc='PSFs'):
             # Just a single spectrum? Or unique spectrum at each field point?
@@ -4351,6 +4922,7 @@ def _calc_psf_from_coeff(self, sp=None, return_oversample=True, return_hdul=True
             wave, psf = res if is_spec else (None, res)
             psf_all.append(psf)
 
+    if nfield>1:
         if return_hdul:
             xvals, yvals = coord_vals # coord_vals isn't None for nfield>1
             hdul = fits.HDUList()
@@ -4448,28 +5020,23 @@ def _coeff_mod_wfe_drift(self, wfe_drift, coord_vals, coord_frame, siaf_ap=None)
         trans = np.atleast_1d(trans)
 
         # Linearly combine on- and off-axis coefficients based on transmission
-        cf_fit_on  = self._psf_coeff_mod['wfe_drift'] 
-        cf_fit_off = self._psf_coeff_mod['wfe_drift_off'] 
-        lxmap      = self._psf_coeff_mod['wfe_drift_lxmap'] 
-
-        # Fit functions
-        cf_mod_list = []
-        for cf_fit in [cf_fit_on, cf_fit_off]:
-            cf_fit_shape = cf_fit.shape
-            cf_fit = cf_fit.reshape([cf_fit.shape[0], -1])
-            wfe_drift = np.atleast_1d(wfe_drift)
-            cf_mod = jl_poly(wfe_drift, cf_fit, use_legendre=True, lxmap=lxmap)
-            cf_mod = cf_mod.reshape(cf_fit_shape[1:])
-            cf_mod_list.append(cf_mod)
-
-        cf_mod = []
-        for t in trans:
-            # Linear combination of on/off to determine final mod
-            # Get a and b values for each position            
-            avals, bvals = (t, 1-t)
-            cf_mod_on, cf_mod_off = cf_mod_list
-            cf_mod.append(avals * cf_mod_off + bvals * cf_mod_on)
-        cf_mod = np.asarray(cf_mod)
+        cf_stack = self._psf_coeff_mod.get('wfe_drift_stack')
+        if cf_stack is None or cf_stack.shape[1]!=2:
+            cf_fit_on  = self._psf_coeff_mod['wfe_drift'] 
+            cf_fit_off = self._psf_coeff_mod['wfe_drift_off'] 
+            cf_stack = np.stack([cf_fit_on, cf_fit_off], axis=1)
+        lxmap = self._psf_coeff_mod['wfe_drift_lxmap'] 
+
+        # Evaluate on- and off-axis fits in a single call
+        cf_stack_shape = cf_stack.shape
+        cf_stack = cf_stack.reshape([cf_stack_shape[0], -1])
+        wfe_drift = np.atleast_1d(wfe_drift)
+        cf_mod = jl_poly(wfe_drift, cf_stack, use_legendre=True, lxmap=lxmap)
+        cf_mod_on, cf_mod_off = cf_mod.reshape(cf_stack_shape[1:])
+
+        # Linear combination of on/off to determine final mod at each position
+        tvals = trans.reshape([-1] + [1]*cf_mod_on.ndim)
+        cf_mod = tvals * cf_mod_off + (1 - tvals) * cf_mod_on
 
         if len(trans)==1:
             cf_mod = cf_mod[0]
@@ -4752,7 +5319,7 @@ def coron_grid(self, npsf_per_axis, xoff_vals=None, yoff_vals=None):
 
 def _calc_psfs_grid(self, sp=None, wfe_drift=0, osamp=1, npsf_per_full_fov=15,
                     xsci_vals=None, ysci_vals=None, return_coords=None,
-                    use_coeff=True, **kwargs):
+                    use_coeff=True, nproc=1, **kwargs):
 
     """Create a grid of PSFs across an instrumnet FoV
     
@@ -4794,6 +5361,9 @@ def _calc_psfs_grid(self, sp=None, wfe_drift=0, osamp=1, npsf_per_full_fov=15,
         Output is then xvals, yvals, hdul_psfs.
     use_coeff : bool
         If True, uses `calc_psf_from_coeff`, other STPSF's built-in `calc_psf`.
+    nproc : int
+        Number of processes used to compute PSF positions in parallel
+        when `use_coeff=False`. Default is 1.
     """
 
     # Observation aperture
@@ -4846,6 +5416,25 @@ def _calc_psfs_grid(self, sp=None, wfe_drift=0, osamp=1, npsf_per_full_fov=15,
     if use_coeff:
         hdul_psfs = self.calc_psf_from_coeff(sp=sp, coord_vals=(xtel_psf, ytel_psf), coord_frame='tel', 
                                              wfe_drift=wfe_drift, return_oversample=True, **kwargs)
+    elif nproc > 1:
+        # Send a copy without (potentially large) PSF coefficients to workers
+        inst = copy(self)
+        inst.psf_coeff = None
+        inst._psf_coeff_mod = {k: None for k in self._psf_coeff_mod.keys()}
+        kwargs['sp'] = sp
+
+        npos = len(xtel_psf)
+        worker_arguments = [(inst, xoff, yoff, kwargs) for xoff, yoff in zip(xtel_psf, ytel_psf)]
+        hdul_psfs = fits.HDUList()
+        try:
+            pool = _get_psf_pool(nproc)
+            for hdu in tqdm(pool.map(_wrap_psf_grid_for_mp, worker_arguments), total=npos):
+                hdul_psfs.append(hdu)
+        except Exception as e:
+            _log.error('Caught an exception during multiprocess.')
+            _log.info('Closing multiprocess pool.')
+            shutdown_psf_pool()
+            raise e
     else:
         hdul_psfs = fits.HDUList()
         npos = len(xtel_psf)
@@ -4879,6 +5468,19 @@ def _calc_psfs_grid(self, sp=None, wfe_drift=0, osamp=1, npsf_per_full_fov=15,
     return res
 
 
+def _wrap_psf_grid_for_mp(args):
+    """
+    Internal helper routine for computing STPSF PSFs at grid 
+    positions across multiple processors.
+
+    args => (inst, xtel, ytel, kwargs)
+    """
+    inst, xoff, yoff, kwargs = args
+    res = inst.calc_psf(coord_vals=(xoff,yoff), coord_frame='tel', 
+                        return_oversample=True, **kwargs)
+    # If add_distortion take index 2, otherwise index 0
+    return res[2] if len(res)==4 else res[0]
+
 def _calc_psfs_sgd(self, xoff_asec, yoff_asec, use_coeff=True, return_oversample=True, **kwargs):
     """Calculate small grid dithers PSFs"""
 
@@ -4887,6 +5489,9 @@ def _calc_psfs_sgd(self, xoff_asec, yoff_asec, use_coeff=True, return_oversample
         return
 
     if use_coeff:
+        # SGD patterns are only a handful of positions, so evaluate the mask-dependent
+        # coefficients for all offsets at once rather than one field point at a time
+        kwargs.setdefault('break_iter', False)
         result = self.calc_psf_from_coeff(coord_frame='idl', coord_vals=(xoff_asec,yoff_asec), 
                                           return_oversample=return_oversample, siaf_ap=self.siaf_ap, **kwargs)
     else:
@@ -4928,9 +5533,9 @@ def nrc_mask_trans(image_mask, x, y):
 
     import scipy
 
-    if not isinstance(x, np.ndarray):
-        x = np.asarray([x]).flatten()
-        y = np.asarray([y]).flatten()
+    # Evaluate all coordinates at once as float arrays
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    y = np.atleast_1d(np.asarray(y, dtype=float))
 
     if image_mask[-1]=='R':
 
@@ -4975,7 +5580,7 @@ def nrc_mask_trans(image_mask, x, y):
         else:
             raise NotImplementedError(f"{image_mask} not a valid name for NIRCam wedge occulter")
 
-        sigmas = np.poly1d(polyfitcoeffs)(scalefact)
+        sigmas = np.polyval(polyfitcoeffs, scalefact)
 
         sigmar = sigmas * np.abs(y)
         # clip sigma: The minimum is to avoid divide by zero